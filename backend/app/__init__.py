@@ -1,5 +1,9 @@
 from app.utils.app_factory import create_base_app
 
-def create_app():
-    """创建Flask应用 - 应用工厂模式"""
-    return create_base_app()
\ No newline at end of file
+def create_app(config_cls=None):
+    """创建Flask应用 - 应用工厂模式
+    
+    Args:
+        config_cls: 可选的配置类（如 app.config.TestingConfig），默认使用 BaseConfig
+    """
+    return create_base_app(config_cls)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+应用配置类
+create_app(config_cls) 可传入配置类覆盖默认配置，未指定的项仍从环境变量读取
+"""
+
+
+class BaseConfig:
+    """基础配置"""
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # 密码哈希算法，None 表示使用 Werkzeug 默认算法
+    PASSWORD_HASH_METHOD = None
+    # 建库时是否创建默认管理员（admin / admin123）
+    CREATE_DEFAULT_ADMIN = True
+
+
+class TestingConfig(BaseConfig):
+    """测试配置：内存SQLite，密码哈希只迭代一次，建库和创建用户几乎无开销"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
+    # 测试账户由测试夹具创建，不使用默认管理员的密码
+    CREATE_DEFAULT_ADMIN = False
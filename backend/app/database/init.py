@@ -6,8 +6,8 @@ from sqlalchemy import inspect, text
 def init_database(app):
     """统一的数据库初始化函数 - 支持Supabase和本地SQLite"""
     
-    # 配置数据库连接
-    database_url = os.getenv('DATABASE_URL')
+    # 配置数据库连接（配置类中指定的连接优先，否则读取环境变量）
+    database_url = app.config.get('SQLALCHEMY_DATABASE_URI') or os.getenv('DATABASE_URL')
 
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -61,26 +61,27 @@ def init_database(app):
                     print(f"⚠️  添加用户ID列时出错: {e}")
                     db.session.rollback()
                 
-                # 创建默认管理员用户（如果不存在）
-                try:
-                    admin_user = User.find_by_username('admin')
-                    if not admin_user:
-                        admin_user = User.create_user(
-                            username='admin',
-                            email='admin@aigtd.com',
-                            password='admin123',
-                            first_name='系统',
-                            last_name='管理员',
-                            is_admin=True,
-                            is_verified=True
-                        )
-                        print("✅ 已创建默认管理员用户")
-                    else:
-                        print("ℹ️  管理员用户已存在")
-                        
-                except Exception as e:
-                    print(f"⚠️  创建管理员用户时出错: {e}")
-                    db.session.rollback()
+                # 创建默认管理员用户（如果不存在；测试配置下由测试夹具创建账户）
+                if app.config.get('CREATE_DEFAULT_ADMIN', True):
+                    try:
+                        admin_user = User.find_by_username('admin')
+                        if not admin_user:
+                            admin_user = User.create_user(
+                                username='admin',
+                                email='admin@aigtd.com',
+                                password='admin123',
+                                first_name='系统',
+                                last_name='管理员',
+                                is_admin=True,
+                                is_verified=True
+                            )
+                            print("✅ 已创建默认管理员用户")
+                        else:
+                            print("ℹ️  管理员用户已存在")
+                            
+                    except Exception as e:
+                        print(f"⚠️  创建管理员用户时出错: {e}")
+                        db.session.rollback()
             else:
                 print("ℹ️  Supabase环境，跳过表创建（由迁移文件管理）")
                 
@@ -5,7 +5,7 @@ class InfoResource(db.Model):
     """信息资源数据模型"""
     __tablename__ = 'info_resources'
     
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
     title = db.Column(db.String(200), nullable=False)  # 资源标题
     content = db.Column(db.Text, nullable=False)  # 资源详情
     resource_type = db.Column(db.String(50), default='general')  # 资源类型
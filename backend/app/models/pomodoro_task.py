@@ -5,7 +5,7 @@ class PomodoroTask(db.Model):
     """番茄任务数据模型 - AI生成的高效工作任务"""
     __tablename__ = 'pomodoro_tasks'
     
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)  # 使用自增ID
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)  # 使用自增ID
     user_id = db.Column(db.BigInteger, db.ForeignKey('users.id'), nullable=False)  # 所属用户
     
     # AI生成的任务内容
@@ -130,7 +130,8 @@ class PomodoroTask(db.Model):
     @classmethod
     def clear_user_tasks(cls, user_id):
         """清除用户的所有番茄任务"""
-        cls.query.filter_by(user_id=user_id).delete()
+        # 随后立即提交会使会话中的对象全部过期，无需再做会话同步查询
+        cls.query.filter_by(user_id=user_id).delete(synchronize_session=False)
         db.session.commit()
     
     def __repr__(self):
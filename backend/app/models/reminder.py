@@ -5,7 +5,7 @@ from datetime import datetime, date
 class Reminder(db.Model):
     __tablename__ = 'reminders'
 
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
     user_id = db.Column(db.BigInteger, db.ForeignKey('users.id'), nullable=True)
 
     content = db.Column(db.String(500), nullable=False)
@@ -1,4 +1,5 @@
 from app.database import db
+from flask import current_app, has_app_context
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, timezone
 import jwt
@@ -43,8 +44,13 @@ class User(db.Model):
     thinking_records = db.relationship('ThinkingRecord', back_populates='user', lazy='dynamic', cascade='all, delete-orphan')
     
     def set_password(self, password: str) -> None:
-        """设置密码哈希"""
-        self.password_hash = generate_password_hash(password)
+        """设置密码哈希（可通过 PASSWORD_HASH_METHOD 配置算法，测试中用于降低迭代次数）"""
+        # 无应用上下文时（如独立脚本中构造用户）使用 werkzeug 的默认算法
+        method = current_app.config.get('PASSWORD_HASH_METHOD') if has_app_context() else None
+        if method:
+            self.password_hash = generate_password_hash(password, method=method)
+        else:
+            self.password_hash = generate_password_hash(password)
     
     def check_password(self, password: str) -> bool:
         """验证密码"""
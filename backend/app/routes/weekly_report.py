@@ -80,7 +80,13 @@ def get_weekly_report(current_user):
     try:
         # 获取查询参数
         task_type = request.args.get('task_type', 'all')
-        week_offset = int(request.args.get('week_offset', 0))
+        try:
+            week_offset = int(request.args.get('week_offset', 0))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'week_offset必须是整数'
+            }), 400
         
         # 计算周的开始和结束时间
         now = datetime.now(timezone.utc)
@@ -92,15 +98,15 @@ def get_weekly_report(current_user):
         target_monday = current_monday + timedelta(weeks=week_offset)
         target_sunday = target_monday + timedelta(days=6, hours=23, minutes=59, seconds=59)
         
-        # 构建基础查询
-        base_query = Record.query.filter(
-            Record.user_id == current_user.id,
-            Record.status != 'deleted'
-        )
+        # 当前用户的查询（含已删除记录，供统计本周删除的任务）
+        user_query = Record.query.filter(Record.user_id == current_user.id)
         
         # 添加任务类型过滤
         if task_type != 'all':
-            base_query = base_query.filter(Record.task_type == task_type)
+            user_query = user_query.filter(Record.task_type == task_type)
+        
+        # 构建基础查询
+        base_query = user_query.filter(Record.status != 'deleted')
         
         # 1. 获取本周新增任务
         new_tasks_query = base_query.filter(
@@ -132,7 +138,7 @@ def get_weekly_report(current_user):
         status_changed_tasks = status_changed_tasks_query.all()
         
         # 4. 获取本周删除的任务
-        deleted_tasks_query = base_query.filter(
+        deleted_tasks_query = user_query.filter(
             Record.updated_at >= target_monday,
             Record.updated_at <= target_sunday,
             Record.status == 'deleted',
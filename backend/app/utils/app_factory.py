@@ -16,6 +16,7 @@ from app.routes.progress_monitoring import progress_monitoring_bp
 from app.routes.thinking import thinking_bp
 from app.routes.weekly_report import weekly_report_bp
 from app.utils.app_logger import debug_log
+from app.config import BaseConfig
 from app.utils.response_helpers import create_error_response, ErrorCodes
 
 import os, json, logging, traceback
@@ -177,13 +178,14 @@ def setup_basic_routes(app):
         }
 
 
-def create_base_app():
+def create_base_app(config_cls=None):
     """创建基础Flask应用"""
     # 配置日志级别
     configure_logging()
     debug_log.info("🚀 开始创建Flask应用")
     
     app = Flask(__name__)
+    app.config.from_object(config_cls or BaseConfig)
     
     # 配置CORS支持
     CORS(app, 
@@ -217,7 +219,7 @@ def create_base_app():
     try:
         # 初始化数据库
         debug_log.info("🔄 开始初始化数据库")
-        database_url = os.getenv('DATABASE_URL', 'Not set')
+        database_url = app.config.get('SQLALCHEMY_DATABASE_URI') or os.getenv('DATABASE_URL', 'Not set')
         debug_log.error("🔍 数据库配置", {'url': database_url})
         
         init_database(app)
@@ -0,0 +1,39 @@
+"""
+pytest 共享夹具
+整个测试会话只创建一次Flask应用（TestingConfig：内存SQLite），各测试文件按需注入
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from app.config import TestingConfig
+from app.database import db
+
+
+@pytest.fixture(scope='session')
+def app():
+    """会话级应用：只构建一次，并在整个会话期间保持应用上下文"""
+    application = create_app(TestingConfig)
+
+    with application.app_context():
+        yield application
+        db.session.remove()
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    """会话级测试客户端"""
+    return app.test_client()
+
+
+@pytest.fixture
+def db_session(app):
+    """数据库会话：测试结束后回滚未提交的改动"""
+    yield db.session
+    db.session.rollback()
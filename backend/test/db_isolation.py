@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+测试共用的数据库隔离工具
+测试在外层事务中运行，路由里的commit只释放SAVEPOINT，结束时整体回滚
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+
+def _emit_begin(connection):
+    connection.exec_driver_sql('BEGIN')
+
+
+@contextmanager
+def rollback_session(db):
+    """
+    在外层事务中替换 db.session，退出时回滚并恢复原会话
+
+    SQLite 下让 pysqlite 正确支持 SAVEPOINT：关闭驱动自带的事务管理，由SQLAlchemy显式发出BEGIN。
+    这两项改动只作用于本次取出的连接，退出时撤销，不影响连接池中的其他连接。
+    """
+    connection = db.engine.connect()
+    is_sqlite = db.engine.dialect.name == 'sqlite'
+    if is_sqlite:
+        driver_connection = connection.connection.driver_connection
+        original_isolation_level = driver_connection.isolation_level
+        driver_connection.isolation_level = None
+        event.listen(connection, 'begin', _emit_begin)
+    trans = connection.begin()
+    
+    original_session = db.session
+    db.session = scoped_session(sessionmaker(bind=connection, join_transaction_mode='create_savepoint'))
+    try:
+        yield db.session
+    finally:
+        db.session.remove()
+        db.session = original_session
+        trans.rollback()
+        if is_sqlite:
+            event.remove(connection, 'begin', _emit_begin)
+            driver_connection.isolation_level = original_isolation_level
+        connection.close()
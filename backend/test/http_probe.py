@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+请求钩子/日志测试共用的HTTP探测工具
+依次发送一组典型请求（不插入等待），并提示需要在Flask控制台中核对的输出；
+另提供并发发送互不依赖请求的 ThreadSessionPool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+# 默认探测的请求：(方法, 路径, 描述)
+PROBE_CASES = [
+    ('GET', '/api/records', 'API请求'),
+    ('GET', '/health', '非API请求'),
+    ('GET', '/', '根路径'),
+    ('POST', '/api/info-resources', 'POST API请求')
+]
+
+
+def health_barrier(session, base_url):
+    """
+    日志是同步输出的，无需逐个等待；最后发一个健康检查作为屏障，
+    确保同一连接上之前的请求都已处理完毕
+    """
+    session.get(f"{base_url}/health")
+
+
+def probe(base_url, expectations, cases=PROBE_CASES):
+    """
+    发送探测请求，并打印需要在后端控制台核对的预期输出
+    后端未运行时跳过测试，其他请求错误使测试失败
+    """
+    with requests.Session() as session:
+        try:
+            for method, path, description in cases:
+                print(f"\n   测试 {description}: {method} {path}")
+                if method == 'GET':
+                    response = session.get(f"{base_url}{path}")
+                elif method == 'POST':
+                    response = session.post(f"{base_url}{path}", json={"title": "测试"})
+
+                print(f"   状态码: {response.status_code}")
+
+            health_barrier(session, base_url)
+        except requests.exceptions.ConnectionError:
+            pytest.skip(f"无法连接到后端服务: {base_url}")
+        except requests.exceptions.RequestException as e:
+            pytest.fail(f"请求失败: {e}")
+
+    print("\n   📋 检查Flask应用控制台输出:")
+    for expectation in expectations:
+        print(f"   - {expectation}")
+
+
+class ThreadSessionPool:
+    """
+    并发发送互不依赖的请求：requests.Session 不是线程安全的，每个工作线程各自持有一个会话
+
+    线程和会话在多批请求间复用，close() 时关闭线程池和全部会话
+    """
+
+    def __init__(self, max_workers, make_session=requests.Session):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._make_session = make_session
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._make_session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _send(self, method, url, kwargs):
+        return self._session().request(method, url, **kwargs)
+
+    def submit(self, method, url, **kwargs):
+        """在工作线程中发送请求（参数同 requests.Session.request），返回 Future"""
+        return self._executor.submit(self._send, method, url, kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+测试脚本共用的输出缓冲工具
+测试函数内的 print 先写入内存缓冲区，函数结束时一次性输出，避免逐行写 stdout
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+from functools import wraps
+
+
+def buffered_output(func):
+    """装饰器：缓冲被装饰函数的 print 输出，结束（包括抛出异常）时一次性写出"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+测试共用的账户数据
+根目录 conftest 和 scripts 的进程内模式都从这里创建测试账户，账户列表只维护一份
+"""
+
+# 测试账户：与 scripts/ 下接口脚本使用的账户一致
+TEST_ACCOUNTS = [
+    {'username': 'admin', 'email': 'admin@example.com', 'password': 'AdminPass123!', 'is_admin': True},
+    {'username': 'testuser', 'email': 'testuser@example.com', 'password': 'TestPass123!'},
+    {'username': 'testlogin', 'email': 'testlogin@example.com', 'password': 'TestLogin123!'},
+]
+
+
+def seed_test_accounts():
+    """
+    在当前应用上下文的测试数据库中创建缺失的测试账户
+    
+    只允许在 TestingConfig 的应用中调用；已存在的账户保持不变，不会改写其密码或权限
+    """
+    from flask import current_app
+    from app.models.user import User
+    
+    if not current_app.config.get('TESTING'):
+        raise RuntimeError('测试账户只能写入 TestingConfig 的测试数据库')
+    
+    for account in TEST_ACCOUNTS:
+        if User.find_by_username(account['username']) is None:
+            User.create_user(**account)
@@ -4,9 +4,10 @@
 """
 
 import requests
-import time
 import os
 
+from http_probe import ThreadSessionPool
+
 BASE_URL = 'http://localhost:5050'
 
 def test_enhanced_logging():
@@ -18,55 +19,37 @@ def test_enhanced_logging():
     print(f"   LOG_HEADER_LENGTH: {os.getenv('LOG_HEADER_LENGTH', '200')}")
     print(f"   LOG_REQUEST_PAYLOAD_LENGTH: {os.getenv('LOG_REQUEST_PAYLOAD_LENGTH', '500')}")
     
-    # 测试1: GET请求（无请求体）
-    print("\n   测试1: GET请求（无请求体）")
-    try:
-        response = requests.get(f"{BASE_URL}/api/records")
-        print(f"   状态码: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ 请求失败: {e}")
-    
-    time.sleep(0.5)
-    
-    # 测试2: POST请求（JSON请求体）
-    print("\n   测试2: POST请求（JSON请求体）")
-    try:
-        response = requests.post(f"{BASE_URL}/api/info-resources", json={
+    # 四个请求互不依赖：各线程用自己的会话并发发出，结果按原顺序输出
+    large_content = "这是一个很长的测试内容。" * 50  # 创建大内容
+    cases = [
+        ('测试1: GET请求（无请求体）', 'GET', '/api/records', {}),
+        ('测试2: POST请求（JSON请求体）', 'POST', '/api/info-resources', {'json': {
             "title": "测试标题",
             "content": "这是一个测试内容，用来验证请求体日志记录功能是否正常工作。",
             "resource_type": "note"
-        })
-        print(f"   状态码: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ 请求失败: {e}")
-    
-    time.sleep(0.5)
-    
-    # 测试3: POST请求（大请求体）
-    print("\n   测试3: POST请求（大请求体）")
-    try:
-        large_content = "这是一个很长的测试内容。" * 50  # 创建大内容
-        response = requests.post(f"{BASE_URL}/api/info-resources", json={
+        }}),
+        ('测试3: POST请求（大请求体）', 'POST', '/api/info-resources', {'json': {
             "title": "大内容测试",
             "content": large_content,
             "resource_type": "article"
-        })
-        print(f"   状态码: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ 请求失败: {e}")
-    
-    time.sleep(0.5)
-    
-    # 测试4: POST请求（表单数据）
-    print("\n   测试4: POST请求（表单数据）")
-    try:
-        response = requests.post(f"{BASE_URL}/api/records", data={
+        }}),
+        ('测试4: POST请求（表单数据）', 'POST', '/api/records', {'data': {
             "content": "表单数据测试",
             "category": "task"
-        })
-        print(f"   状态码: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ 请求失败: {e}")
+        }})
+    ]
+    
+    with ThreadSessionPool(max_workers=len(cases)) as pool:
+        futures = [pool.submit(method, f"{BASE_URL}{endpoint}", timeout=5, **kwargs)
+                   for _, method, endpoint, kwargs in cases]
+    
+    for (description, _, _, _), future in zip(cases, futures):
+        print(f"\n   {description}")
+        try:
+            response = future.result()
+            print(f"   状态码: {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            print(f"   ❌ 请求失败: {e}")
     
     print("\n   ✅ 检查后端控制台，应该看到详细的请求日志信息")
     print("   - 请求头信息（如果LOG_HEADER_LENGTH > 0）")
@@ -87,8 +70,6 @@ def test_env_variables():
     except requests.exceptions.RequestException as e:
         print(f"   ❌ 请求失败: {e}")
     
-    time.sleep(0.5)
-    
     # 测试禁用请求体日志
     print("\n   测试禁用请求体日志 (LOG_REQUEST_PAYLOAD_LENGTH=0)")
     os.environ['LOG_HEADER_LENGTH'] = '100'
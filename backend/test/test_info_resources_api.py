@@ -4,12 +4,40 @@
 测试API的CRUD功能
 """
 
+import atexit
 import requests
 import json
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_probe import ThreadSessionPool
 
 BASE_URL = "http://localhost:5050"
 
+def make_session():
+    """创建会话：复用连接，并对连接失败/5xx等瞬时错误自动重试，避免整套流程重跑"""
+    session = requests.Session()
+    # POST 不在重试范围内：服务端可能已写入记录后才返回5xx，重发会创建重复数据
+    session.mount('http://', HTTPAdapter(max_retries=Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+        raise_on_status=False  # 重试耗尽后仍返回最后的响应，保留原有的失败输出
+    )))
+    return session
+
+# 主流程顺序执行，共用一个会话
+SESSION = make_session()
+# 只读请求批量并发发送，线程及其各自的会话在多批之间复用
+BATCH_POOL = ThreadSessionPool(max_workers=2, make_session=make_session)
+atexit.register(BATCH_POOL.close)
+
+def fetch_batch(*urls):
+    """并发发出一组互不依赖的只读请求，返回与urls顺序一致的Future列表"""
+    return [BATCH_POOL.submit('GET', url) for url in urls]
+
 def test_info_resources_api():
     """测试信息资源API"""
     print("🧪 开始测试信息资源API...")
@@ -23,7 +51,7 @@ def test_info_resources_api():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/info-resources", json=create_data)
+        response = SESSION.post(f"{BASE_URL}/api/info-resources", json=create_data)
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 201:
@@ -40,10 +68,16 @@ def test_info_resources_api():
         print(f"❌ 请求异常: {e}")
         return False
     
+    # 第2、3步都是只读请求且互不依赖，合并为一批并发发出
+    list_future, detail_future = fetch_batch(
+        f"{BASE_URL}/api/info-resources",
+        f"{BASE_URL}/api/info-resources/{resource_id}"
+    )
+    
     # 测试获取信息资源列表
     print("\n2. 测试获取信息资源列表...")
     try:
-        response = requests.get(f"{BASE_URL}/api/info-resources")
+        response = list_future.result()
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -61,7 +95,7 @@ def test_info_resources_api():
     # 测试获取单个信息资源
     print(f"\n3. 测试获取单个信息资源 (ID: {resource_id})...")
     try:
-        response = requests.get(f"{BASE_URL}/api/info-resources/{resource_id}")
+        response = detail_future.result()
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -87,7 +121,7 @@ def test_info_resources_api():
     }
     
     try:
-        response = requests.put(f"{BASE_URL}/api/info-resources/{resource_id}", json=update_data)
+        response = SESSION.put(f"{BASE_URL}/api/info-resources/{resource_id}", json=update_data)
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -102,10 +136,16 @@ def test_info_resources_api():
     except Exception as e:
         print(f"❌ 请求异常: {e}")
     
+    # 第5、6步同样是互不依赖的只读请求（需在第4步更新之后）
+    search_future, filter_future = fetch_batch(
+        f"{BASE_URL}/api/info-resources?search=测试",
+        f"{BASE_URL}/api/info-resources?resource_type=note"
+    )
+    
     # 测试搜索功能
     print("\n5. 测试搜索功能...")
     try:
-        response = requests.get(f"{BASE_URL}/api/info-resources?search=测试")
+        response = search_future.result()
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -122,7 +162,7 @@ def test_info_resources_api():
     # 测试类型筛选
     print("\n6. 测试类型筛选...")
     try:
-        response = requests.get(f"{BASE_URL}/api/info-resources?resource_type=note")
+        response = filter_future.result()
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -139,7 +179,7 @@ def test_info_resources_api():
     # 测试归档功能
     print(f"\n7. 测试归档功能 (ID: {resource_id})...")
     try:
-        response = requests.post(f"{BASE_URL}/api/info-resources/{resource_id}/archive")
+        response = SESSION.post(f"{BASE_URL}/api/info-resources/{resource_id}/archive")
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -156,7 +196,7 @@ def test_info_resources_api():
     # 测试恢复功能
     print(f"\n8. 测试恢复功能 (ID: {resource_id})...")
     try:
-        response = requests.post(f"{BASE_URL}/api/info-resources/{resource_id}/restore")
+        response = SESSION.post(f"{BASE_URL}/api/info-resources/{resource_id}/restore")
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
@@ -173,7 +213,7 @@ def test_info_resources_api():
     # 测试删除功能
     print(f"\n9. 测试删除功能 (ID: {resource_id})...")
     try:
-        response = requests.delete(f"{BASE_URL}/api/info-resources/{resource_id}")
+        response = SESSION.delete(f"{BASE_URL}/api/info-resources/{resource_id}")
         print(f"状态码: {response.status_code}")
         
         if response.status_code == 200:
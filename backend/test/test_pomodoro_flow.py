@@ -8,6 +8,9 @@ import os
 import sys
 import json
 from pathlib import Path
+import pytest
+from flask import current_app, has_app_context
+from sqlalchemy import text
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
@@ -33,7 +36,7 @@ def create_test_user():
             password_hash='dummy_hash'  # 测试用户不需要真实密码
         )
         db.session.add(test_user)
-        db.session.commit()
+        db.session.flush()  # 仅获取ID，由调用方统一提交
     
     print(f"✅ 测试用户ID: {test_user.id}")
     return test_user
@@ -43,8 +46,7 @@ def create_test_tasks(user_id):
     print("📋 创建测试任务...")
     
     # 清除该用户的现有任务
-    Record.query.filter_by(user_id=user_id).delete()
-    db.session.commit()
+    Record.query.filter_by(user_id=user_id).delete(synchronize_session=False)
     
     test_tasks = [
         {
@@ -73,16 +75,12 @@ def create_test_tasks(user_id):
         }
     ]
     
-    created_tasks = []
+    # 直接批量插入字典，省去ORM实例构造与逐条INSERT；由调用方统一提交
     for task_data in test_tasks:
-        task = Record(
-            user_id=user_id,
-            **task_data
-        )
-        db.session.add(task)
-        created_tasks.append(task)
+        task_data['user_id'] = user_id
+    db.session.bulk_insert_mappings(Record, test_tasks)
     
-    db.session.commit()
+    created_tasks = Record.query.filter_by(user_id=user_id).order_by(Record.id).all()
     print(f"✅ 创建了{len(created_tasks)}个测试任务")
     return created_tasks
 
@@ -156,8 +154,8 @@ def test_statistics(user_id):
     print(f"\n📊 测试统计信息...")
     
     from app.models.pomodoro_task import PomodoroTask
-    from sqlalchemy import func
-    from datetime import datetime, date
+    from sqlalchemy import func, and_
+    from datetime import datetime, date, time, timedelta
     
     # 获取统计数据
     stats_query = PomodoroTask.query.filter_by(user_id=user_id)
@@ -176,10 +174,15 @@ def test_statistics(user_id):
     total_pomodoros = totals.total_pomodoros or 0
     total_focus_time = totals.total_focus_time or 0
     
-    # 今日统计
+    # 今日统计：使用时间范围而非 func.date()，便于走 created_at 索引
     today = date.today()
+    today_start = datetime.combine(today, time.min)
+    tomorrow_start = datetime.combine(today + timedelta(days=1), time.min)
     today_tasks = stats_query.filter(
-        func.date(PomodoroTask.created_at) == today
+        and_(
+            PomodoroTask.created_at >= today_start,
+            PomodoroTask.created_at < tomorrow_start
+        )
     )
     
     today_completed = today_tasks.filter_by(status='completed').count()
@@ -223,26 +226,26 @@ def test_statistics(user_id):
         }
     }
 
+@pytest.mark.usefixtures('app')
 def test_api_routes():
-    """测试API路由"""
+    """测试API路由（复用调用方已推入的应用上下文，不再重复创建应用）"""
     print("\n🌐 测试API路由注册...")
     
-    app = create_app()
+    assert has_app_context(), "test_api_routes 需要在应用上下文中调用"
     
-    with app.app_context():
-        # 检查路由是否注册
-        pomodoro_routes = []
-        for rule in app.url_map.iter_rules():
-            if 'pomodoro' in rule.rule:
-                pomodoro_routes.append({
-                    'endpoint': rule.endpoint,
-                    'methods': list(rule.methods),
-                    'rule': rule.rule
-                })
-        
-        print(f"✅ 发现{len(pomodoro_routes)}个番茄钟API路由:")
-        for route in pomodoro_routes:
-            print(f"  {route['rule']} - {route['methods']}")
+    # 检查路由是否注册
+    pomodoro_routes = []
+    for rule in current_app.url_map.iter_rules():
+        if 'pomodoro' in rule.rule:
+            pomodoro_routes.append({
+                'endpoint': rule.endpoint,
+                'methods': list(rule.methods),
+                'rule': rule.rule
+            })
+    
+    print(f"✅ 发现{len(pomodoro_routes)}个番茄钟API路由:")
+    for route in pomodoro_routes:
+        print(f"  {route['rule']} - {route['methods']}")
     
     return pomodoro_routes
 
@@ -254,13 +257,19 @@ def main():
     app = create_app()
     
     with app.app_context():
+        # 测试库可随时丢弃：SQLite下关闭日志落盘和fsync，加速数据准备
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(text('PRAGMA journal_mode=MEMORY'))
+            db.session.execute(text('PRAGMA synchronous=OFF'))
+        
         try:
             # 1. 测试API路由
             test_api_routes()
             
-            # 2. 创建测试数据
+            # 2. 创建测试数据（单个事务，一次提交）
             test_user = create_test_user()
             create_test_tasks(test_user.id)
+            db.session.commit()
             
             # 3. 测试生成番茄任务
             generate_result = test_generate_pomodoro_tasks(test_user.id)
@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+import pytest
+
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -71,16 +73,13 @@ def create_mock_pomodoro_tasks(user_id):
         }
     ]
     
-    created_tasks = []
+    # 直接批量插入字典，省去ORM实例构造与逐条INSERT
     for task_data in mock_tasks:
-        task = PomodoroTask(
-            user_id=user_id,
-            **task_data
-        )
-        db.session.add(task)
-        created_tasks.append(task)
-    
+        task_data['user_id'] = user_id
+    db.session.bulk_insert_mappings(PomodoroTask, mock_tasks)
     db.session.commit()
+    
+    created_tasks = PomodoroTask.query.filter_by(user_id=user_id).order_by(PomodoroTask.order_index).all()
     print(f"✅ 创建了{len(created_tasks)}个模拟番茄任务")
     return created_tasks
 
@@ -155,10 +154,10 @@ def test_statistics(user_id):
     tasks = PomodoroTask.query.filter_by(user_id=user_id).all()
     
     total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == 'completed'])
-    active_tasks = len([t for t in tasks if t.status == 'active'])
-    pending_tasks = len([t for t in tasks if t.status == 'pending'])
-    skipped_tasks = len([t for t in tasks if t.status == 'skipped'])
+    completed_tasks = sum(1 for t in tasks if t.status == 'completed')
+    active_tasks = sum(1 for t in tasks if t.status == 'active')
+    pending_tasks = sum(1 for t in tasks if t.status == 'pending')
+    skipped_tasks = sum(1 for t in tasks if t.status == 'skipped')
     
     total_pomodoros = sum(t.pomodoros_completed for t in tasks)
     total_focus_time = sum(t.total_focus_time for t in tasks)
@@ -190,6 +189,7 @@ def test_statistics(user_id):
         'completion_rate': completion_rate
     }
 
+@pytest.mark.usefixtures('app')
 def test_api_data_format():
     """测试API数据格式"""
     print("\n🔗 测试API数据格式...")
@@ -28,7 +28,7 @@ def ensure_user():
 
 def create_samples(user_id):
     # cleanup
-    Reminder.query.filter_by(user_id=user_id).delete()
+    Reminder.query.filter_by(user_id=user_id).delete(synchronize_session=False)
     db.session.commit()
 
     now = datetime.utcnow()
@@ -4,11 +4,84 @@
 验证前端到后端的完整数据流
 """
 
-import os
+import logging
 import sys
-import json
-import requests
-from pathlib import Path
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# 模拟API返回的数据只构建一次，以只读映射保存，各次调用直接复用
+_MOCK_TASKS = (
+    MappingProxyType({
+        'id': 1,
+        'title': '完成前端组件开发',
+        'description': '开发React组件',
+        'priority_score': 85,
+        'estimated_pomodoros': 3,
+        'status': 'pending',
+        'pomodoros_completed': 0,
+        'total_focus_time': 0,
+        'order_index': 1
+    }),
+    MappingProxyType({
+        'id': 2,
+        'title': '编写API文档',
+        'description': '为REST API编写文档',
+        'priority_score': 70,
+        'estimated_pomodoros': 2,
+        'status': 'pending',
+        'pomodoros_completed': 0,
+        'total_focus_time': 0,
+        'order_index': 2
+    })
+)
+
+_MOCK_STATS = MappingProxyType({
+    'total_stats': MappingProxyType({
+        'total_tasks': 5,
+        'completed_tasks': 2,
+        'active_tasks': 1,
+        'pending_tasks': 2,
+        'skipped_tasks': 0,
+        'total_pomodoros': 8,
+        'total_focus_time': 200,
+        'completion_rate': 40.0
+    }),
+    'today_stats': MappingProxyType({
+        'today_completed_tasks': 1,
+        'today_pomodoros': 3,
+        'today_focus_time': 75,
+        'today_focus_hours': 1.3
+    })
+})
+
+# 模拟AI生成的任务
+_MOCK_GENERATED = (
+    MappingProxyType({
+        'id': 3,
+        'title': '优化数据库查询',
+        'description': '提升查询性能',
+        'priority_score': 90,
+        'estimated_pomodoros': 2,
+        'status': 'pending',
+        'pomodoros_completed': 0,
+        'total_focus_time': 0,
+        'order_index': 1,
+        'ai_reasoning': '高优先级性能问题'
+    }),
+)
+
+# 计时器分、秒取值都在0-59之间，预先生成两位数字符串
+_D2 = tuple(f"{i:02d}" for i in range(60))
+
+_RESPONSE_CACHE = {}
+
+def _cached_response(key, data):
+    """按key缓存成功响应，同一模拟接口始终返回同一个响应对象"""
+    response = _RESPONSE_CACHE.get(key)
+    if response is None:
+        response = _RESPONSE_CACHE[key] = {'success': True, 'data': data}
+    return response
 
 def test_ui_component():
     """测试UI组件的关键功能"""
@@ -16,6 +89,27 @@ def test_ui_component():
     
     # 模拟PomodoroManager组件的状态管理
     class MockPomodoroManager:
+        # 固定的实例属性存放在槽位中，不再为每个实例维护 __dict__
+        __slots__ = (
+            '_tasks', '_by_id', 'stats', 'loading', 'generating', 'activeTaskId',
+            'timerMinutes', 'timerSeconds', 'isTimerRunning', 'showStats'
+        )
+        
+        # 优先级颜色按分数档位（<40, 40-59, 60-79, >=80）索引
+        PRIORITY_COLORS = (
+            'text-green-600 bg-green-50',
+            'text-yellow-600 bg-yellow-50',
+            'text-orange-600 bg-orange-50',
+            'text-red-600 bg-red-50'
+        )
+        
+        STATUS_ICONS = {
+            'completed': '✅',
+            'active': '▶️',
+            'skipped': '⏭️',
+            'pending': '⏸️'
+        }
+        
         def __init__(self):
             self.tasks = []
             self.stats = None
@@ -27,6 +121,16 @@ def test_ui_component():
             self.isTimerRunning = False
             self.showStats = False
         
+        @property
+        def tasks(self):
+            return self._tasks
+        
+        @tasks.setter
+        def tasks(self, value):
+            """替换任务列表时同步重建 id→任务 索引，按ID查找任务为O(1)"""
+            self._tasks = value
+            self._by_id = {task['id']: task for task in value}
+        
         def mock_api_response(self, success=True, data=None):
             """模拟API响应"""
             if success:
@@ -37,58 +141,17 @@ def test_ui_component():
         def load_pomodoro_tasks(self):
             """模拟加载番茄任务"""
             print("  📋 加载番茄任务...")
-            mock_tasks = [
-                {
-                    'id': 1,
-                    'title': '完成前端组件开发',
-                    'description': '开发React组件',
-                    'priority_score': 85,
-                    'estimated_pomodoros': 3,
-                    'status': 'pending',
-                    'pomodoros_completed': 0,
-                    'total_focus_time': 0,
-                    'order_index': 1
-                },
-                {
-                    'id': 2,
-                    'title': '编写API文档',
-                    'description': '为REST API编写文档',
-                    'priority_score': 70,
-                    'estimated_pomodoros': 2,
-                    'status': 'pending',
-                    'pomodoros_completed': 0,
-                    'total_focus_time': 0,
-                    'order_index': 2
-                }
-            ]
-            response = self.mock_api_response(True, {'tasks': mock_tasks})
+            response = _cached_response('tasks', {'tasks': _MOCK_TASKS})
             if response['success']:
-                self.tasks = response['data']['tasks']
+                # 任务状态会被修改，复制一份，缓存中的原型保持不变
+                self.tasks = [dict(task) for task in response['data']['tasks']]
                 print(f"    ✅ 加载了{len(self.tasks)}个任务")
             return response
         
         def load_stats(self):
             """模拟加载统计信息"""
             print("  📊 加载统计信息...")
-            mock_stats = {
-                'total_stats': {
-                    'total_tasks': 5,
-                    'completed_tasks': 2,
-                    'active_tasks': 1,
-                    'pending_tasks': 2,
-                    'skipped_tasks': 0,
-                    'total_pomodoros': 8,
-                    'total_focus_time': 200,
-                    'completion_rate': 40.0
-                },
-                'today_stats': {
-                    'today_completed_tasks': 1,
-                    'today_pomodoros': 3,
-                    'today_focus_time': 75,
-                    'today_focus_hours': 1.3
-                }
-            }
-            response = self.mock_api_response(True, mock_stats)
+            response = _cached_response('stats', _MOCK_STATS)
             if response['success']:
                 self.stats = response['data']
                 print("    ✅ 统计信息加载成功")
@@ -99,26 +162,10 @@ def test_ui_component():
             print("  🍅 生成番茄任务...")
             self.generating = True
             
-            # 模拟AI生成的任务
-            new_tasks = [
-                {
-                    'id': 3,
-                    'title': '优化数据库查询',
-                    'description': '提升查询性能',
-                    'priority_score': 90,
-                    'estimated_pomodoros': 2,
-                    'status': 'pending',
-                    'pomodoros_completed': 0,
-                    'total_focus_time': 0,
-                    'order_index': 1,
-                    'ai_reasoning': '高优先级性能问题'
-                }
-            ]
-            
-            response = self.mock_api_response(True, {'tasks': new_tasks})
+            response = _cached_response('generated', {'tasks': _MOCK_GENERATED})
             if response['success']:
-                self.tasks = response['data']['tasks']
-                print(f"    ✅ 生成了{len(new_tasks)}个新任务")
+                self.tasks = [dict(task) for task in response['data']['tasks']]
+                print(f"    ✅ 生成了{len(self.tasks)}个新任务")
             
             self.generating = False
             return response
@@ -128,7 +175,7 @@ def test_ui_component():
             print(f"  ▶️ 启动任务 ID:{task_id}...")
             
             # 找到任务并更新状态
-            task = next((t for t in self.tasks if t['id'] == task_id), None)
+            task = self._by_id.get(task_id)
             if task:
                 task['status'] = 'active'
                 task['started_at'] = '2025-09-13T16:20:00Z'
@@ -147,7 +194,7 @@ def test_ui_component():
             """模拟完成任务"""
             print(f"  ✅ 完成任务 ID:{task_id}...")
             
-            task = next((t for t in self.tasks if t['id'] == task_id), None)
+            task = self._by_id.get(task_id)
             if task:
                 task['pomodoros_completed'] += 1
                 task['total_focus_time'] += 25
@@ -169,28 +216,15 @@ def test_ui_component():
         
         def format_time(self, minutes, seconds):
             """格式化时间显示"""
-            return f"{minutes:02d}:{seconds:02d}"
+            return _D2[minutes] + ':' + _D2[seconds]
         
         def get_priority_color(self, score):
             """获取优先级颜色"""
-            if score >= 80:
-                return 'text-red-600 bg-red-50'
-            elif score >= 60:
-                return 'text-orange-600 bg-orange-50'
-            elif score >= 40:
-                return 'text-yellow-600 bg-yellow-50'
-            else:
-                return 'text-green-600 bg-green-50'
+            return self.PRIORITY_COLORS[(score >= 40) + (score >= 60) + (score >= 80)]
         
         def get_status_icon(self, status):
             """获取状态图标"""
-            icons = {
-                'completed': '✅',
-                'active': '▶️',
-                'skipped': '⏭️',
-                'pending': '⏸️'
-            }
-            return icons.get(status, '⏸️')
+            return self.STATUS_ICONS.get(status, '⏸️')
     
     # 测试UI组件流程
     print("\n🧪 测试UI组件完整流程:")
@@ -233,78 +267,65 @@ def test_ui_component():
     
     # 7. 测试扁平化显示
     print("\n7️⃣ 测试扁平化任务显示...")
+    lines = []
     for i, task in enumerate(manager.tasks[:3]):  # 只显示前3个
         priority_color = manager.get_priority_color(task['priority_score'])
         status_icon = manager.get_status_icon(task['status'])
-        print(f"    #{i+1} {status_icon} {task['title'][:20]}... (优先级:{task['priority_score']}, {task['estimated_pomodoros']}🍅)")
+        lines.append(f"    #{i+1} {status_icon} {task['title'][:20]}... (优先级:{task['priority_score']}, {task['estimated_pomodoros']}🍅)")
+    # 拼接后一次性写出，避免逐行print
+    sys.stdout.write('\n'.join(lines) + '\n')
     
     print("\n✅ UI组件测试完成")
     
     return manager
 
+# test_api_structure 展示的接口定义为固定常量，只在模块加载时构建一次
+# API端点
+_API_ENDPOINTS = (
+    ('POST', '/api/pomodoro/tasks/generate', '生成番茄任务'),
+    ('GET', '/api/pomodoro/tasks', '获取任务列表'),
+    ('POST', '/api/pomodoro/tasks/{id}/start', '启动任务'),
+    ('POST', '/api/pomodoro/tasks/{id}/complete', '完成任务'),
+    ('POST', '/api/pomodoro/tasks/{id}/skip', '跳过任务'),
+    ('GET', '/api/pomodoro/stats', '获取统计信息')
+)
+
+# 任务数据格式
+_TASK_FORMAT = MappingProxyType({
+    'id': 'number',
+    'user_id': 'number',
+    'title': 'string',
+    'description': 'string',
+    'priority_score': 'number(1-100)',
+    'estimated_pomodoros': 'number(1-4)',
+    'order_index': 'number',
+    'status': 'enum(pending|active|completed|skipped)',
+    'started_at': 'ISO datetime or null',
+    'completed_at': 'ISO datetime or null',
+    'pomodoros_completed': 'number',
+    'total_focus_time': 'number(minutes)',
+    'ai_reasoning': 'string',
+    'created_at': 'ISO datetime',
+    'updated_at': 'ISO datetime'
+})
+
 def test_api_structure():
     """测试API数据结构"""
     print("\n🔗 测试API数据结构...")
     
-    # API端点测试
-    api_endpoints = [
-        ('POST', '/api/pomodoro/tasks/generate', '生成番茄任务'),
-        ('GET', '/api/pomodoro/tasks', '获取任务列表'),
-        ('POST', '/api/pomodoro/tasks/{id}/start', '启动任务'),
-        ('POST', '/api/pomodoro/tasks/{id}/complete', '完成任务'),
-        ('POST', '/api/pomodoro/tasks/{id}/skip', '跳过任务'),
-        ('GET', '/api/pomodoro/stats', '获取统计信息')
-    ]
-    
     print("📋 API端点列表:")
-    for method, endpoint, description in api_endpoints:
-        print(f"  {method} {endpoint} - {description}")
+    sys.stdout.write(''.join(
+        f"  {method} {endpoint} - {description}\n"
+        for method, endpoint, description in _API_ENDPOINTS
+    ))
     
     # 测试数据格式
     print("\n📄 API数据格式测试:")
     
-    # 任务数据格式
-    task_format = {
-        'id': 'number',
-        'user_id': 'number',
-        'title': 'string',
-        'description': 'string',
-        'priority_score': 'number(1-100)',
-        'estimated_pomodoros': 'number(1-4)',
-        'order_index': 'number',
-        'status': 'enum(pending|active|completed|skipped)',
-        'started_at': 'ISO datetime or null',
-        'completed_at': 'ISO datetime or null',
-        'pomodoros_completed': 'number',
-        'total_focus_time': 'number(minutes)',
-        'ai_reasoning': 'string',
-        'created_at': 'ISO datetime',
-        'updated_at': 'ISO datetime'
-    }
-    
     print("  任务数据格式:")
-    for field, type_desc in task_format.items():
-        print(f"    {field}: {type_desc}")
-    
-    # 统计数据格式  
-    stats_format = {
-        'total_stats': {
-            'total_tasks': 'number',
-            'completed_tasks': 'number',
-            'active_tasks': 'number',
-            'pending_tasks': 'number',
-            'skipped_tasks': 'number',
-            'total_pomodoros': 'number',
-            'total_focus_time': 'number',
-            'completion_rate': 'number(0-100)'
-        },
-        'today_stats': {
-            'today_completed_tasks': 'number',
-            'today_pomodoros': 'number',
-            'today_focus_time': 'number',
-            'today_focus_hours': 'number'
-        }
-    }
+    sys.stdout.write(''.join(
+        f"    {field}: {type_desc}\n" for field, type_desc in _TASK_FORMAT.items()
+    ))
     
     print("\n  统计数据格式:")
     print("    total_stats: 总体统计")
@@ -397,10 +418,10 @@ def main():
         
     except Exception as e:
         print(f"\n❌ 验证测试失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("验证测试失败")
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     success = main()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -6,67 +6,95 @@
 
 import requests
 import json
+import os
 import sys
+import atexit
+from requests.adapters import HTTPAdapter
+from output_buffer import buffered_output
+
+# JSON编解码与 scripts/ 下的接口脚本共用 _jsonio（可选依赖 orjson）
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+from _jsonio import dumps as encode, dumps_pretty
 
 BASE_URL = "http://localhost:5050"
+URL_RECORDS = BASE_URL + "/api/records"
+URL_INFO_RESOURCES = BASE_URL + "/api/info-resources"
+
+# 设置 VERBOSE=1 时才格式化打印完整响应体
+VERBOSE = bool(os.environ.get('VERBOSE'))
+
+# 请求体在模块加载时预先序列化一次，以 data= 直接发送字节（Content-Type 已在会话上设置）
+EMPTY_BODY = encode({})
+OVERSIZED_RECORD_BODY = encode({"content": "x" * 6000})  # 超过5000字符限制
+UNTITLED_INFO_RESOURCE_BODY = encode({"content": "测试内容"})
+RECORD_BODY = encode({"content": "测试记录内容", "category": "task"})
+INFO_RESOURCE_BODY = encode({
+    "title": "测试信息资源",
+    "content": "测试信息资源内容",
+    "resource_type": "note"
+})
+MERGED_LOGGING_RECORD_BODY = encode({"content": "合并日志测试记录"})
 
+# 共享会话：所有请求复用同一连接池（HTTP keep-alive）
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+atexit.register(SESSION.close)
+
+def print_response(response):
+    """VERBOSE模式下打印格式化的响应体，默认只输出状态码"""
+    if VERBOSE:
+        print(f"   响应: {dumps_pretty(response.json())}")
+
+@buffered_output
 def test_error_responses():
     """测试各种错误响应"""
     print("🧪 测试统一错误响应处理...")
     
     # 测试1: 缺少必需字段
     print("\n1. 测试缺少必需字段错误:")
-    response = requests.post(f"{BASE_URL}/api/records", json={})
+    response = SESSION.post(URL_RECORDS, data=EMPTY_BODY)
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
     
     # 测试2: 字段值无效
     print("\n2. 测试字段值无效错误:")
-    response = requests.post(f"{BASE_URL}/api/records", json={
-        "content": "x" * 6000  # 超过5000字符限制
-    })
+    response = SESSION.post(URL_RECORDS, data=OVERSIZED_RECORD_BODY)
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
     
     # 测试3: 无效的认证token
     print("\n3. 测试认证错误:")
-    response = requests.get(f"{BASE_URL}/api/records", headers={
+    response = SESSION.get(URL_RECORDS, headers={
         "Authorization": "Bearer invalid_token"
     })
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
     
     # 测试4: 信息资源缺少标题
     print("\n4. 测试信息资源缺少标题:")
-    response = requests.post(f"{BASE_URL}/api/info-resources", json={
-        "content": "测试内容"
-    })
+    response = SESSION.post(URL_INFO_RESOURCES, data=UNTITLED_INFO_RESOURCE_BODY)
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
 
+@buffered_output
 def test_success_responses():
     """测试成功响应"""
     print("\n🧪 测试统一成功响应处理...")
     
     # 测试创建记录
     print("\n1. 测试创建记录成功:")
-    response = requests.post(f"{BASE_URL}/api/records", json={
-        "content": "测试记录内容",
-        "category": "task"
-    })
+    response = SESSION.post(URL_RECORDS, data=RECORD_BODY)
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
     
     # 测试创建信息资源
     print("\n2. 测试创建信息资源成功:")
-    response = requests.post(f"{BASE_URL}/api/info-resources", json={
-        "title": "测试信息资源",
-        "content": "测试信息资源内容",
-        "resource_type": "note"
-    })
+    response = SESSION.post(URL_INFO_RESOURCES, data=INFO_RESOURCE_BODY)
     print(f"   状态码: {response.status_code}")
-    print(f"   响应: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    print_response(response)
 
+@buffered_output
 def test_merged_logging():
     """测试合并后的日志记录"""
     print("\n🧪 测试合并后的日志记录...")
@@ -78,15 +106,11 @@ def test_merged_logging():
     
     # 发送请求触发自动日志记录
     print("\n   发送成功请求触发自动日志记录...")
-    response = requests.post(f"{BASE_URL}/api/records", json={
-        "content": "合并日志测试记录"
-    })
+    response = SESSION.post(URL_RECORDS, data=MERGED_LOGGING_RECORD_BODY)
     print(f"   请求完成，状态码: {response.status_code}")
     
     print("\n   发送错误请求触发自动日志记录...")
-    response = requests.post(f"{BASE_URL}/api/records", json={
-        "content": "x" * 6000  # 触发错误
-    })
+    response = SESSION.post(URL_RECORDS, data=OVERSIZED_RECORD_BODY)  # 触发错误
     print(f"   请求完成，状态码: {response.status_code}")
     
     print("\n   ✅ 检查后端控制台，应该看到自动记录的日志信息")
@@ -98,7 +122,7 @@ def main():
     
     try:
         # 检查服务器是否运行
-        response = requests.get(f"{BASE_URL}/api/records", timeout=5)
+        response = SESSION.get(URL_RECORDS, timeout=5)
         print("✅ 后端服务器运行正常")
     except requests.exceptions.RequestException as e:
         print(f"❌ 无法连接到后端服务器: {e}")
@@ -1,42 +1,42 @@
 #!/usr/bin/env python3
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app import create_app
 from app.models.user import User, db
+from output_buffer import buffered_output
 
-def test_user():
-    app = create_app()
-    with app.app_context():
-        user = User.find_by_username('testuser')
-        if user:
-            print('找到用户:', user.username)
-            print('用户ID:', user.id)
-            print('用户邮箱:', user.email)
-            print('密码哈希:', user.password_hash[:50] + '...' if user.password_hash else 'None')
-            print('用户激活状态:', user.is_active)
-            print('账户是否锁定:', user.is_account_locked())
-            print('失败登录次数:', user.failed_login_attempts)
-            
-            # 测试密码验证
-            test_passwords = ['Test123!@#', 'testpassword', 'password123', 'admin123', '123456']
-            for pwd in test_passwords:
-                result = user.check_password(pwd)
-                print(f'密码 "{pwd}" 验证结果:', result)
-                
-            # 直接测试Werkzeug的check_password_hash函数
-            from werkzeug.security import check_password_hash
-            for pwd in test_passwords:
-                direct_result = check_password_hash(user.password_hash, pwd)
-                print(f'直接验证 "{pwd}":', direct_result)
-        else:
-            print('用户不存在')
-            
-        # 列出所有用户
-        all_users = User.query.all()
-        print(f'\n数据库中共有 {len(all_users)} 个用户:')
-        for u in all_users:
-            print(f'  - {u.username} ({u.email})')
+@buffered_output
+def test_user(app):
+    """检查测试用户及密码校验（pytest下由conftest的app夹具提供应用上下文）"""
+    user = User.find_by_username('testuser')
+    if user:
+        print('找到用户:', user.username)
+        print('用户ID:', user.id)
+        print('用户邮箱:', user.email)
+        print('密码哈希:', user.password_hash[:50] + '...' if user.password_hash else 'None')
+        print('用户激活状态:', user.is_active)
+        print('账户是否锁定:', user.is_account_locked())
+        print('失败登录次数:', user.failed_login_attempts)
+        
+        # 测试密码验证：PBKDF2计算期间hashlib会释放GIL，多个候选密码可并行校验
+        # check_password 直接委托给 Werkzeug 的 check_password_hash，无需再逐个重复验证一遍
+        test_passwords = ['Test123!@#', 'testpassword', 'password123', 'admin123', '123456']
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(user.check_password, test_passwords))
+        for pwd, result in zip(test_passwords, results):
+            print(f'密码 "{pwd}" 验证结果:', result)
+    else:
+        print('用户不存在')
+        
+    # 列出所有用户
+    all_users = User.query.all()
+    print(f'\n数据库中共有 {len(all_users)} 个用户:')
+    for u in all_users:
+        print(f'  - {u.username} ({u.email})')
 
 if __name__ == '__main__':
-    test_user()
+    app = create_app()
+    with app.app_context():
+        test_user(app)
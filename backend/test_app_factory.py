@@ -3,11 +3,20 @@
 测试重构后的统一应用工厂
 """
 
+import json
+import os
+import sys
 import requests
-import time
+
+# 与 test/ 下的日志测试共用 /health 屏障
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'))
+from http_probe import health_barrier
 
 BASE_URL = 'http://localhost:5050'
 
+# POST请求体只序列化一次，以字节形式发送
+POST_BODY = json.dumps({"title": "测试"}, ensure_ascii=False).encode('utf-8')
+
 def test_unified_app_factory():
     """测试统一的应用工厂"""
     print("🧪 测试重构后的统一应用工厂...")
@@ -21,13 +30,15 @@ def test_unified_app_factory():
         ('POST', '/api/info-resources', 'POST API请求')
     ]
     
+    # 所有请求共用一个会话，keep-alive复用同一TCP连接
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json'})
+    
     for method, path, description in test_cases:
         print(f"\n   测试 {description}: {method} {path}")
         try:
-            if method == 'GET':
-                response = requests.get(f"{BASE_URL}{path}")
-            elif method == 'POST':
-                response = requests.post(f"{BASE_URL}{path}", json={"title": "测试"})
+            body = POST_BODY if method == 'POST' else None
+            response = session.request(method, f"{BASE_URL}{path}", data=body)
             
             print(f"   状态码: {response.status_code}")
             if response.status_code == 200:
@@ -39,8 +50,12 @@ def test_unified_app_factory():
             
         except requests.exceptions.RequestException as e:
             print(f"   ❌ 请求失败: {e}")
-        
-        time.sleep(0.5)
+    
+    try:
+        health_barrier(session, BASE_URL)
+    except requests.exceptions.RequestException:
+        pass
+    session.close()
     
     print("\n   📋 检查Flask应用控制台输出:")
     print("   - 应该看到统一的日志格式")
@@ -0,0 +1,58 @@
+"""
+根目录测试脚本的共享夹具
+整个测试会话只创建一次Flask应用（TestingConfig：内存SQLite）和测试客户端，并保持应用上下文
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+# backend/test 下的共用测试工具（db_isolation、seed_data 等）
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'test'))
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    会话级应用：TestingConfig（内存SQLite），数据库引擎、蓝图和JWT配置只初始化一次，
+    不依赖本地数据库文件或运行中的后端；测试账户在会话开始时创建
+    """
+    from app import create_app
+    from app.config import TestingConfig
+    from seed_data import seed_test_accounts
+    
+    application = create_app(TestingConfig)
+    ctx = application.app_context()
+    ctx.push()
+    seed_test_accounts()
+    
+    yield application
+    ctx.pop()
+
+@pytest.fixture(scope="session")
+def client(app):
+    """会话级测试客户端"""
+    return app.test_client()
+
+@pytest.fixture(scope="session")
+def auth(client):
+    """会话级登录（testlogin）：密码校验整个会话只做一次，返回 (access_token, 用户信息, 认证头)"""
+    response = client.post('/api/auth/login', json={'username': 'testlogin', 'password': 'TestLogin123!'})
+    assert response.status_code == 200, response.get_json()
+    
+    result = response.get_json()
+    access_token = result['access_token']
+    return access_token, result['user'], {'Authorization': f'Bearer {access_token}'}
+
+@pytest.fixture
+def db_session(app):
+    """
+    数据库会话：测试在外层事务中运行，路由里的commit只释放SAVEPOINT，
+    结束时整体回滚，写入的数据对下一个测试不可见，也不会留在数据库中
+    """
+    from app.database import db
+    from db_isolation import rollback_session
+    
+    with rollback_session(db) as session:
+        yield session
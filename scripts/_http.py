@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+接口测试脚本共用的HTTP客户端
+
+默认通过 requests 访问运行中的后端（localhost:5050），复用 keep-alive 连接；
+设置环境变量 USE_TEST_CLIENT=1 时改为在进程内调用 Flask 的 test_client，
+不经过套接字，也不需要单独启动后端；应用使用 TestingConfig 的内存数据库，
+不会读写 DATABASE_URL 指向的数据库。
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "http://localhost:5050"
+# 网络模式下每个请求的超时（秒），后端卡住时测试失败而不是一直挂起
+TIMEOUT = 10
+# 网关类瞬时错误和连接失败自动重试（默认只重试幂等方法，POST 不会被重复提交）
+RETRY = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+@lru_cache(maxsize=None)
+def _get_app():
+    """
+    进程内只创建一次 Flask 应用（TestingConfig：内存SQLite，每次运行都是新库）
+
+    测试账户在创建应用时写入（与根目录 conftest 共用 backend/test/seed_data）
+    """
+    test_dir = os.path.join(BACKEND_DIR, "test")
+    for path in (BACKEND_DIR, test_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from app import create_app
+    from app.config import TestingConfig
+    from seed_data import seed_test_accounts
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        seed_test_accounts()
+    return app
+
+class _Response:
+    """脚本使用的 requests.Response 接口子集，用于包装 werkzeug / urllib3 的响应"""
+
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        from _jsonio import loads
+
+        return loads(self.content)
+
+class Client:
+    """
+    统一的HTTP客户端：接口与 requests.Session 的常用部分一致（get/post/put/delete/headers）
+
+    headers 上设置的请求头（如 Authorization）对之后的每个请求生效。
+    scan() 供大列表扫描这类热点 GET 使用：网络模式下直接走 urllib3 连接池，省去 requests 的请求准备与分发开销。
+    """
+
+    def __init__(self):
+        if os.getenv("USE_TEST_CLIENT"):
+            self._c = _get_app().test_client()
+            self._mode = "wsgi"
+            self.headers = {}
+        else:
+            self._c = requests.Session()
+            self._c.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=64,
+                                                 max_retries=RETRY))
+            self._pool = urllib3.PoolManager(num_pools=1, maxsize=16, retries=RETRY,
+                                             timeout=urllib3.Timeout(TIMEOUT))
+            self._mode = "net"
+            self.headers = self._c.headers
+
+    def request(self, method, url, headers=None, params=None, **kwargs):
+        if self._mode == "net":
+            kwargs.setdefault("timeout", TIMEOUT)
+            return self._c.request(method, url, headers=headers, params=params, **kwargs)
+
+        path = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+        merged = {**self.headers, **headers} if headers else self.headers
+        response = self._c.open(path, method=method, headers=merged, query_string=params, **kwargs)
+        return _Response(response.status_code, response.headers, response.get_data())
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def scan(self, url, headers=None):
+        """
+        热点只读扫描（如管理员拉取全部记录）：只返回状态码和原始响应体
+
+        Returns:
+            _Response（status_code / headers / content / json()）
+        """
+        if self._mode == "wsgi":
+            return self.request("GET", url, headers=headers)
+
+        merged = {**self.headers, **headers} if headers else dict(self.headers)
+        try:
+            response = self._pool.request("GET", url, headers=merged)
+        except urllib3.exceptions.MaxRetryError as e:
+            # 只有连不上后端时才转换为 requests 的异常（调用方据此跳过测试），超时等其他错误原样抛出
+            if isinstance(e.reason, urllib3.exceptions.NewConnectionError):
+                raise requests.exceptions.ConnectionError(e) from e
+            raise
+        return _Response(response.status, response.headers, response.data)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        if self._mode == "net":
+            self._c.close()
+            self._pool.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
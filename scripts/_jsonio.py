@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+接口测试脚本共用的JSON编解码
+
+可选依赖：安装了orjson时用它编解码（比标准库快数倍），否则回退到json。
+请求体以 data= 发送预先编码的字节，响应用 loads(response.content) 解析，
+绕开 requests 内部基于标准库 json 的 json= / response.json()；
+dumps_pretty 返回缩进2格的字符串，用于打印响应。
+"""
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    dumps = orjson.dumps
+
+    def dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+
+    loads = json.loads
+
+    def dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def dumps_pretty(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+def _send_json(send, url, payload, headers=None, **kwargs):
+    merged = {**JSON_CONTENT_TYPE, **headers} if headers else JSON_CONTENT_TYPE
+    return send(url, data=dumps(payload), headers=merged, **kwargs)
+
+def post_json(session, url, payload, **kwargs):
+    """以JSON请求体发送POST；session 可以是 requests.Session 或 requests 模块"""
+    return _send_json(session.post, url, payload, **kwargs)
+
+def put_json(session, url, payload, **kwargs):
+    """以JSON请求体发送PUT"""
+    return _send_json(session.put, url, payload, **kwargs)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+接口测试脚本共用的访问令牌缓存
+
+令牌按 (用户名, 密码) 缓存在临时目录的 aigtd_tokens.<系统用户名>.json 中（仅当前用户可读写），
+只有缓存缺失或距过期不足60秒时才重新登录，多个脚本、多次运行共用同一次登录。
+后端更换了 JWT 密钥或重建了数据库时，删除该文件即可；进程内模式（USE_TEST_CLIENT）不使用该缓存。
+"""
+
+import getpass
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import jwt
+
+from _http import BASE_URL, Client
+from _jsonio import loads, post_json
+
+# 按用户区分文件名：共享的临时目录中不会读到或覆盖其他用户的缓存
+CACHE_FILE = os.path.join(tempfile.gettempdir(), f"aigtd_tokens.{getpass.getuser()}.json")
+# 距过期不足该秒数的令牌视为失效，提前重新登录
+REFRESH_MARGIN = 60
+
+def _cache_key(username, password):
+    """缓存键：不在文件中保存明文密码"""
+    return hashlib.sha256(f"{BASE_URL}\0{username}\0{password}".encode("utf-8")).hexdigest()
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    """
+    先写临时文件再 os.replace，并发运行的脚本不会读到写了一半的文件
+
+    缓存中有管理员令牌：临时文件由 mkstemp 以随机文件名、0600 权限创建，替换后的缓存文件只有当前用户可读
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=".aigtd_tokens.", suffix=".tmp",
+                                    dir=os.path.dirname(CACHE_FILE))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _is_fresh(token):
+    try:
+        payload = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return False
+    return payload.get("exp", 0) - time.time() > REFRESH_MARGIN
+
+def get_token(username, password, session=None):
+    """
+    获取访问令牌：优先使用缓存，必要时调用 /api/auth/login 登录
+
+    Args:
+        session: 可选的 _http.Client，用于复用调用方的连接
+
+    Returns:
+        访问令牌；登录失败时返回 None
+    """
+    # 进程内模式每次运行都是新的内存数据库，上次运行的令牌不能复用，也不写入缓存
+    use_cache = not os.getenv("USE_TEST_CLIENT")
+    key = _cache_key(username, password)
+    cache = _load_cache() if use_cache else {}
+
+    token = cache.get(key)
+    if token and _is_fresh(token):
+        return token
+
+    http = session or Client()
+    response = post_json(http, f"{BASE_URL}/api/auth/login",
+                         {"username": username, "password": password})
+    if response.status_code != 200:
+        print(f"{username} 登录失败: {response.status_code}, {response.text}")
+        return None
+
+    token = loads(response.content).get("access_token")
+    if use_cache:
+        cache[key] = token
+        _save_cache(cache)
+    return token
@@ -0,0 +1,57 @@
+"""
+scripts 下接口测试的共享夹具
+登录令牌按会话缓存，并通过 _token_cache 在多个脚本、多次运行间共用
+
+运行方式: pytest scripts/ -n auto --dist=loadgroup
+进程内运行（无需启动后端，使用内存测试数据库，测试账户在会话开始时自动创建）: USE_TEST_CLIENT=1 pytest scripts/
+"""
+
+import os
+
+import pytest
+import requests
+
+from _http import BASE_URL, Client, _get_app
+from _token_cache import get_token
+
+def seed_in_process_app():
+    """进程内模式下在内存测试数据库中写入 setup_test_data 的基础记录（管理员、普通用户和游客各一条）"""
+    app = _get_app()
+    from setup_test_data import setup_test_data
+    
+    with app.app_context():
+        setup_test_data()
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_up():
+    """会话开始时先请求一次 /health：后端的数据库连接等冷启动开销不计入各测试；后端未运行时跳过"""
+    if os.getenv("USE_TEST_CLIENT"):
+        seed_in_process_app()
+    
+    with Client() as client:
+        try:
+            client.get(f"{BASE_URL}/health")
+        except requests.exceptions.ConnectionError:
+            pytest.skip("无法连接到后端服务")
+
+def login(username, password):
+    """获取访问令牌（优先使用跨脚本的令牌缓存）；后端未运行时跳过测试"""
+    try:
+        token = get_token(username, password)
+    except requests.exceptions.ConnectionError:
+        pytest.skip("无法连接到后端服务")
+    
+    if not token:
+        pytest.fail(f"{username} 登录失败")
+    
+    return token
+
+@pytest.fixture(scope="session")
+def admin_token():
+    """管理员访问令牌"""
+    return login("admin", "AdminPass123!")
+
+@pytest.fixture(scope="session")
+def user_token():
+    """普通用户（testuser）访问令牌"""
+    return login("testuser", "TestPass123!")
@@ -32,17 +32,16 @@ def setup_admin_user():
         db.session.commit()
         print("Updated existing admin user")
     else:
-        # Create new admin
+        # Create new admin with its flags set up front, so create_user's commit is the only one
         admin = User.create_user(
             username='admin',
             email='admin@example.com', 
             password='AdminPass123!',
             first_name='Admin',
-            last_name='User'
+            last_name='User',
+            is_admin=True,
+            is_active=True
         )
-        admin.is_admin = True
-        admin.is_active = True
-        db.session.commit()
         print("Created new admin user")
     
     return admin
@@ -51,9 +50,13 @@ def setup_test_data():
     """Create test records"""
     print("Setting up test records...")
     
-    # Get admin and regular user
-    admin = User.find_by_username('admin')
-    user = User.find_by_username('testuser')
+    # Get admin and regular user in a single query
+    users = {
+        u.username: u
+        for u in User.query.filter(User.username.in_(['admin', 'testuser'])).all()
+    }
+    admin = users.get('admin')
+    user = users.get('testuser')
     
     # Create admin record
     if admin:
@@ -1,59 +1,58 @@
 #!/usr/bin/env python3
 """
 测试管理员功能
+
+运行方式: pytest scripts/test_admin_functionality.py -n auto --dist=loadgroup
+登录令牌由 conftest.py 中的会话级夹具提供，每个令牌对应一个带认证头的会话；修改记录的测试归入同一 xdist 分组串行执行
 """
 
-import requests
-import json
+import pytest
+from collections import Counter
+from _http import Client
+from _jsonio import loads, put_json
 
 BASE_URL = "http://localhost:5050"
+RECORDS_URL = f"{BASE_URL}/api/records"
+
+def _authed_session(token):
+    """带认证头的会话：Authorization 只设置一次，调用处无需再传 headers"""
+    session = Client()
+    session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+@pytest.fixture(scope="module")
+def admin_sess(admin_token):
+    """管理员会话"""
+    with _authed_session(admin_token) as session:
+        yield session
 
-def test_admin_login_and_access():
+@pytest.fixture(scope="module")
+def user_sess(user_token):
+    """普通用户会话"""
+    with _authed_session(user_token) as session:
+        yield session
+
+def test_admin_login_and_access(admin_token):
     """测试管理员登录和访问权限"""
     print("=== 测试管理员登录和访问 ===")
     
-    # 1. 管理员登录
-    admin_login = {
-        "username": "admin",
-        "password": "AdminPass123!"
-    }
-    
-    response = requests.post(f"{BASE_URL}/api/auth/login", json=admin_login)
-    if response.status_code != 200:
-        print(f"管理员登录失败: {response.status_code}, {response.json()}")
-        return None
-    
-    admin_token = response.json().get('access_token')
+    assert admin_token, "管理员登录失败"
     print("管理员登录成功")
-    return admin_token
 
-def test_admin_can_see_all_records(admin_token):
+def test_admin_can_see_all_records(admin_sess):
     """测试管理员可以看到所有记录"""
     print("\n=== 测试管理员记录可见性 ===")
     
-    headers = {"Authorization": f"Bearer {admin_token}"}
+    # 获取所有记录：单次 GET + 大列表解析，走 scan 的 urllib3 连接池
+    response = admin_sess.scan(RECORDS_URL)
+    assert response.status_code == 200, f"管理员获取记录失败: {response.status_code}, {response.text}"
     
-    # 获取所有记录
-    response = requests.get(f"{BASE_URL}/api/records", headers=headers)
-    if response.status_code != 200:
-        print(f"管理员获取记录失败: {response.status_code}, {response.json()}")
-        return False
-    
-    records = response.json()['records']
+    records = loads(response.content)['records']
     print(f"管理员可以看到 {len(records)} 条记录:")
     
-    # 统计不同用户的记录
-    user_records = {}
-    guest_records = 0
-    
-    for record in records:
-        user_id = record.get('user_id')
-        if user_id is None:
-            guest_records += 1
-        else:
-            if user_id not in user_records:
-                user_records[user_id] = 0
-            user_records[user_id] += 1
+    # 统计不同用户的记录（游客记录的user_id为None）
+    user_records = Counter(record.get('user_id') for record in records)
+    guest_records = user_records.pop(None, 0)
     
     print(f"  - 游客记录: {guest_records} 条")
     for user_id, count in user_records.items():
@@ -61,33 +60,23 @@ def test_admin_can_see_all_records(admin_token):
     
     # 验证管理员确实可以看到不同用户的记录
     total_users = len(user_records) + (1 if guest_records > 0 else 0)
-    if total_users > 1:
-        print("✅ 管理员可以看到不同用户的记录")
-        return True
-    else:
-        print("❌ 管理员应该能看到不同用户的记录")
-        return False
+    assert total_users > 1, "❌ 管理员应该能看到不同用户的记录"
+    print("✅ 管理员可以看到不同用户的记录")
 
-def test_admin_can_modify_any_record(admin_token):
+@pytest.mark.xdist_group("mutations")
+def test_admin_can_modify_any_record(admin_sess):
     """测试管理员可以修改任何记录"""
     print("\n=== 测试管理员可以修改任何记录 ===")
     
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    
     # 先获取一个非管理员创建的记录
-    response = requests.get(f"{BASE_URL}/api/records", headers=headers)
-    records = response.json()['records']
+    response = admin_sess.get(RECORDS_URL)
+    records = loads(response.content)['records']
     
     # 找一个不属于管理员的记录（user_id != 1，因为admin的ID是1）
-    target_record = None
-    for record in records:
-        if record.get('user_id') != 1:  # admin的ID是1
-            target_record = record
-            break
+    target_record = next((record for record in records if record.get('user_id') != 1), None)
     
     if not target_record:
-        print("没有找到非管理员的记录来测试")
-        return False
+        pytest.skip("没有找到非管理员的记录来测试")
     
     record_id = target_record['id']
     original_content = target_record['content']
@@ -98,71 +87,25 @@ def test_admin_can_modify_any_record(admin_token):
         "status": "active"
     }
     
-    response = requests.put(f"{BASE_URL}/api/records/{record_id}", headers=headers, json=update_data)
-    if response.status_code == 200:
-        print(f"✅ 管理员成功修改了其他用户的记录 (ID: {record_id})")
-        return True
-    else:
-        print(f"❌ 管理员无法修改其他用户的记录: {response.status_code}, {response.json()}")
-        return False
+    response = put_json(admin_sess, f"{RECORDS_URL}/{record_id}", update_data)
+    assert response.status_code == 200, f"❌ 管理员无法修改其他用户的记录: {response.status_code}, {response.text}"
+    print(f"✅ 管理员成功修改了其他用户的记录 (ID: {record_id})")
 
-def compare_user_vs_admin_access():
+@pytest.mark.xdist_group("mutations")
+def test_compare_user_vs_admin_access(admin_sess, user_sess):
     """对比普通用户和管理员的访问权限"""
     print("\n=== 对比普通用户和管理员的访问权限 ===")
     
-    # 普通用户登录
-    user_login = {
-        "username": "testuser",
-        "password": "TestPass123!"
-    }
-    
-    response = requests.post(f"{BASE_URL}/api/auth/login", json=user_login)
-    if response.status_code != 200:
-        print("普通用户登录失败")
-        return
-    
-    user_token = response.json().get('access_token')
-    user_headers = {"Authorization": f"Bearer {user_token}"}
-    
-    # 管理员登录
-    admin_token = test_admin_login_and_access()
-    if not admin_token:
-        return
-    
-    admin_headers = {"Authorization": f"Bearer {admin_token}"}
-    
     # 获取普通用户可见的记录
-    user_response = requests.get(f"{BASE_URL}/api/records", headers=user_headers)
-    user_records_count = len(user_response.json()['records'])
+    user_response = user_sess.get(RECORDS_URL)
+    user_records_count = len(loads(user_response.content)['records'])
     
     # 获取管理员可见的记录
-    admin_response = requests.get(f"{BASE_URL}/api/records", headers=admin_headers)
-    admin_records_count = len(admin_response.json()['records'])
+    admin_response = admin_sess.get(RECORDS_URL)
+    admin_records_count = len(loads(admin_response.content)['records'])
     
     print(f"普通用户可见记录数: {user_records_count}")
     print(f"管理员可见记录数: {admin_records_count}")
     
-    if admin_records_count > user_records_count:
-        print("✅ 管理员比普通用户能看到更多记录")
-    else:
-        print("❌ 管理员应该比普通用户能看到更多记录")
-
-if __name__ == "__main__":
-    try:
-        admin_token = test_admin_login_and_access()
-        if admin_token:
-            test1 = test_admin_can_see_all_records(admin_token)
-            test2 = test_admin_can_modify_any_record(admin_token)
-            compare_user_vs_admin_access()
-            
-            if test1 and test2:
-                print("\n✅ 管理员功能测试通过！")
-            else:
-                print("\n❌ 管理员功能测试失败")
-        else:
-            print("无法测试管理员功能，登录失败")
-            
-    except requests.exceptions.ConnectionError:
-        print("错误: 无法连接到后端服务")
-    except Exception as e:
-        print(f"测试过程中发生错误: {e}")
\ No newline at end of file
+    assert admin_records_count > user_records_count, "❌ 管理员应该比普通用户能看到更多记录"
+    print("✅ 管理员比普通用户能看到更多记录")
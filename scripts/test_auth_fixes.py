@@ -2,31 +2,41 @@
 """
 测试用户认证和记录访问权限的脚本
 验证修复后的JWT解析和权限控制是否正常工作
+
+pytest 运行时 user_token/admin_token 由 conftest.py 的会话级夹具提供；
+会写入记录的测试归入 xdist 分组 "mutations"，与其他修改数据的测试串行执行
 """
 
+import pytest
 import requests
-import json
+from _http import Client
+from _jsonio import loads, post_json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:5050"
+RECORDS_URL = f"{BASE_URL}/api/records"
+
+SESSION = Client()
 
-def test_guest_access():
-    """测试游客访问权限"""
+@pytest.mark.xdist_group("mutations")
+def test_guest_access(session=SESSION):
+    """测试游客访问权限（session 默认为模块共享客户端，并发运行时由调用方传入独立客户端）"""
     print("=== 测试游客访问 ===")
     
     # 创建公共记录（不带token）
-    response = requests.post(f"{BASE_URL}/api/records", 
-                           json={"content": "游客创建的公共记录", "category": "note"})
-    print(f"创建公共记录: {response.status_code}, {response.json()}")
+    response = post_json(session, RECORDS_URL,
+                         {"content": "游客创建的公共记录", "category": "note"})
+    print(f"创建公共记录: {response.status_code}, {loads(response.content)}")
+    assert response.status_code == 200, f"游客创建记录失败: {response.status_code}"
     
     # 获取记录列表（不带token）
-    response = requests.get(f"{BASE_URL}/api/records")
-    print(f"游客获取记录列表: {response.status_code}, 记录数: {len(response.json().get('records', []))}")
-    
-    return response.status_code == 200
+    response = session.get(RECORDS_URL)
+    assert response.status_code == 200, f"游客获取记录列表失败: {response.status_code}"
+    print(f"游客获取记录列表: {response.status_code}, 记录数: {len(loads(response.content).get('records', []))}")
 
-def test_user_registration_and_login():
-    """测试用户注册和登录"""
+def register_user_and_login(session=SESSION):
+    """注册并登录普通测试用户（脚本方式运行时使用；pytest 下由 user_token 夹具代替）"""
     print("\n=== 测试用户注册和登录 ===")
     
     # 注册测试用户
@@ -38,8 +48,8 @@ def test_user_registration_and_login():
         "last_name": "User"
     }
     
-    response = requests.post(f"{BASE_URL}/api/auth/register", json=user_data)
-    print(f"用户注册: {response.status_code}, {response.json()}")
+    response = post_json(session, f"{BASE_URL}/api/auth/register", user_data)
+    print(f"用户注册: {response.status_code}, {loads(response.content)}")
     
     # 登录
     login_data = {
@@ -47,17 +57,17 @@ def test_user_registration_and_login():
         "password": "TestPass123!"
     }
     
-    response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data)
+    response = post_json(session, f"{BASE_URL}/api/auth/login", login_data)
     if response.status_code == 200:
-        token = response.json().get('access_token')
+        token = loads(response.content).get('access_token')
         print(f"用户登录成功: {response.status_code}")
         return token
     else:
-        print(f"用户登录失败: {response.status_code}, {response.json()}")
+        print(f"用户登录失败: {response.status_code}, {loads(response.content)}")
         return None
 
-def test_admin_creation():
-    """创建管理员用户"""
+def create_admin_and_login(session=SESSION):
+    """注册并登录管理员（脚本方式运行时使用；pytest 下由 admin_token 夹具代替）"""
     print("\n=== 创建管理员用户 ===")
     
     admin_data = {
@@ -68,7 +78,7 @@ def test_admin_creation():
         "last_name": "User"
     }
     
-    response = requests.post(f"{BASE_URL}/api/auth/register", json=admin_data)
+    response = post_json(session, f"{BASE_URL}/api/auth/register", admin_data)
     print(f"管理员注册: {response.status_code}")
     
     # 手动设置管理员权限（需要直接操作数据库）
@@ -78,100 +88,112 @@ def test_admin_creation():
         "password": "AdminPass123!"
     }
     
-    response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data)
+    response = post_json(session, f"{BASE_URL}/api/auth/login", login_data)
     if response.status_code == 200:
-        admin_token = response.json().get('access_token')
+        admin_token = loads(response.content).get('access_token')
         print(f"管理员登录成功: {response.status_code}")
         return admin_token
     else:
-        print(f"管理员登录失败: {response.status_code}, {response.json()}")
+        print(f"管理员登录失败: {response.status_code}, {loads(response.content)}")
         return None
 
-def test_user_record_access(user_token):
+@pytest.mark.xdist_group("mutations")
+def test_user_record_access(user_token, session=SESSION):
     """测试普通用户记录访问权限"""
     print("\n=== 测试普通用户记录访问 ===")
     
     headers = {"Authorization": f"Bearer {user_token}"}
     
     # 创建用户记录
-    response = requests.post(f"{BASE_URL}/api/records",
-                           headers=headers,
-                           json={"content": "用户创建的私人记录", "category": "task"})
-    print(f"创建用户记录: {response.status_code}, {response.json()}")
-    
-    # 获取记录列表（应该只看到自己的记录）
-    response = requests.get(f"{BASE_URL}/api/records", headers=headers)
-    if response.status_code == 200:
-        records = response.json().get('records', [])
-        print(f"用户获取记录列表: {response.status_code}, 记录数: {len(records)}")
-        
-        # 检查记录是否都属于当前用户
-        for record in records:
-            print(f"  记录ID: {record.get('id')}, 内容: {record.get('content')[:30]}...")
-    else:
-        print(f"用户获取记录失败: {response.status_code}, {response.json()}")
-    
-    return response.status_code == 200
+    response = post_json(session, RECORDS_URL,
+                         {"content": "用户创建的私人记录", "category": "task"}, headers=headers)
+    body = loads(response.content)
+    print(f"创建用户记录: {response.status_code}, {body}")
+    assert response.status_code == 200, f"用户创建记录失败: {response.status_code}, {body}"
+    created_id = body['record']['id']
+    
+    # 获取记录列表（应该能看到刚创建的记录）
+    response = session.get(RECORDS_URL, headers=headers)
+    assert response.status_code == 200, f"用户获取记录失败: {response.status_code}, {loads(response.content)}"
+    
+    records = loads(response.content).get('records', [])
+    print(f"用户获取记录列表: {response.status_code}, 记录数: {len(records)}")
+    for record in records:
+        print(f"  记录ID: {record.get('id')}, 内容: {record.get('content')[:30]}...")
+    
+    assert any(record.get('id') == created_id for record in records), "用户看不到自己刚创建的记录"
 
-def test_admin_record_access(admin_token):
+def test_admin_record_access(admin_token, session=SESSION):
     """测试管理员记录访问权限"""
     print("\n=== 测试管理员记录访问 ===")
     
     headers = {"Authorization": f"Bearer {admin_token}"}
     
-    # 获取记录列表（应该看到所有记录）
-    response = requests.get(f"{BASE_URL}/api/records", headers=headers)
-    if response.status_code == 200:
-        records = response.json().get('records', [])
-        print(f"管理员获取记录列表: {response.status_code}, 记录数: {len(records)}")
-        
-        # 显示记录详情
-        for record in records:
-            user_id = record.get('user_id', 'NULL')
-            print(f"  记录ID: {record.get('id')}, user_id: {user_id}, 内容: {record.get('content')[:30]}...")
-    else:
-        print(f"管理员获取记录失败: {response.status_code}, {response.json()}")
+    # 获取记录列表（应该看到所有记录）：单次 GET + 大列表解析，走 scan 的 urllib3 连接池
+    response = session.scan(RECORDS_URL, headers=headers)
+    assert response.status_code == 200, f"管理员获取记录失败: {response.status_code}, {loads(response.content)}"
+    
+    records = loads(response.content).get('records', [])
+    print(f"管理员获取记录列表: {response.status_code}, 记录数: {len(records)}")
     
-    return response.status_code == 200
+    # 显示记录详情
+    for record in records:
+        user_id = record.get('user_id', 'NULL')
+        print(f"  记录ID: {record.get('id')}, user_id: {user_id}, 内容: {record.get('content')[:30]}...")
 
 def test_token_validation():
     """测试Token验证"""
     print("\n=== 测试Token验证 ===")
     
-    # 使用无效token
+    # 无效token与错误格式token两个探测互不依赖，并发发送
     invalid_headers = {"Authorization": "Bearer invalid_token"}
-    response = requests.get(f"{BASE_URL}/api/records", headers=invalid_headers)
-    print(f"无效token访问: {response.status_code}")
-    
-    # 使用错误格式的token
-    malformed_headers = {"Authorization": "malformed_token"} 
-    response = requests.get(f"{BASE_URL}/api/records", headers=malformed_headers)
-    print(f"格式错误token访问: {response.status_code}")
+    malformed_headers = {"Authorization": "malformed_token"}
+    # 每个线程使用自己的客户端（requests.Session 不是线程安全的）
+    with Client() as invalid_client, Client() as malformed_client, \
+            ThreadPoolExecutor(max_workers=2) as executor:
+        invalid_future = executor.submit(invalid_client.get, RECORDS_URL, headers=invalid_headers)
+        malformed_future = executor.submit(malformed_client.get, RECORDS_URL, headers=malformed_headers)
+    
+    invalid_status = invalid_future.result().status_code
+    malformed_status = malformed_future.result().status_code
+    print(f"无效token访问: {invalid_status}")
+    print(f"格式错误token访问: {malformed_status}")
+    
+    assert invalid_status == 401, f"无效token应返回401，实际: {invalid_status}"
+    assert malformed_status == 401, f"格式错误token应返回401，实际: {malformed_status}"
+
+def run_guest_flow():
+    """游客流程：使用独立客户端"""
+    with Client() as session:
+        test_guest_access(session)
+
+def run_user_flow():
+    """普通用户流程：注册登录后检查记录访问，使用独立客户端"""
+    with Client() as session:
+        user_token = register_user_and_login(session)
+        if user_token:
+            test_user_record_access(user_token, session)
+
+def run_admin_flow():
+    """管理员流程：注册登录后检查记录访问，使用独立客户端"""
+    with Client() as session:
+        admin_token = create_admin_and_login(session)
+        if admin_token:
+            test_admin_record_access(admin_token, session)
 
 def main():
     """主测试函数"""
     print("开始测试用户认证和权限控制...")
     
     try:
-        # 测试游客访问
-        test_guest_access()
+        # 游客、普通用户、管理员三条流程和Token验证互不依赖，并发执行（各流程的输出可能交错）
+        flows = [run_guest_flow, run_user_flow, run_admin_flow, test_token_validation]
+        with ThreadPoolExecutor(max_workers=len(flows)) as executor:
+            futures = [executor.submit(flow) for flow in flows]
         
-        # 测试用户注册和登录
-        user_token = test_user_registration_and_login()
-        
-        # 测试管理员创建和登录
-        admin_token = test_admin_creation()
-        
-        # 测试Token验证
-        test_token_validation()
-        
-        # 测试用户记录访问
-        if user_token:
-            test_user_record_access(user_token)
-        
-        # 测试管理员记录访问
-        if admin_token:
-            test_admin_record_access(admin_token)
+        # 按顺序取结果，任一流程的异常（包括断言失败）在这里抛出
+        for future in futures:
+            future.result()
             
         print("\n=== 测试完成 ===")
         
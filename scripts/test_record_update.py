@@ -4,26 +4,25 @@
 """
 
 import requests
-import json
+
+from _http import Client
+from _jsonio import loads, post_json, put_json
+from _token_cache import get_token
 
 BASE_URL = "http://localhost:5050"
+RECORDS_URL = f"{BASE_URL}/api/records"
+
+SESSION = Client()
 
 def test_update_record():
     """测试记录更新"""
     print("=== 测试记录更新功能 ===")
     
-    # 1. 先登录获取token
-    login_data = {
-        "username": "testuser",
-        "password": "TestPass123!"
-    }
-    
-    response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data)
-    if response.status_code != 200:
-        print(f"登录失败: {response.status_code}, {response.json()}")
+    # 1. 先获取token（优先使用缓存，必要时才登录）
+    token = get_token("testuser", "TestPass123!", session=SESSION)
+    if not token:
         return False
     
-    token = response.json().get('access_token')
     headers = {"Authorization": f"Bearer {token}"}
     print("登录成功")
     
@@ -34,12 +33,12 @@ def test_update_record():
         "priority": "medium"
     }
     
-    response = requests.post(f"{BASE_URL}/api/records", headers=headers, json=record_data)
+    response = post_json(SESSION, RECORDS_URL, record_data, headers=headers)
     if response.status_code != 201:
-        print(f"创建记录失败: {response.status_code}, {response.json()}")
+        print(f"创建记录失败: {response.status_code}, {loads(response.content)}")
         return False
     
-    record = response.json()['record']
+    record = loads(response.content)['record']
     record_id = record['id']
     print(f"创建记录成功，ID: {record_id}")
     
@@ -51,13 +50,13 @@ def test_update_record():
         "progress": 50
     }
     
-    response = requests.put(f"{BASE_URL}/api/records/{record_id}", headers=headers, json=update_data)
+    response = put_json(SESSION, f"{RECORDS_URL}/{record_id}", update_data, headers=headers)
     if response.status_code == 200:
-        updated_record = response.json()['record']
+        updated_record = loads(response.content)['record']
         print(f"更新记录成功: {updated_record['content']}, 优先级: {updated_record['priority']}, 进度: {updated_record['progress']}%")
         return True
     else:
-        print(f"更新记录失败: {response.status_code}, {response.json()}")
+        print(f"更新记录失败: {response.status_code}, {loads(response.content)}")
         return False
 
 def test_invalid_token_update():
@@ -67,9 +66,9 @@ def test_invalid_token_update():
     headers = {"Authorization": "Bearer invalid_token"}
     update_data = {"content": "尝试用无效token更新"}
     
-    response = requests.put(f"{BASE_URL}/api/records/1", headers=headers, json=update_data)
+    response = put_json(SESSION, f"{RECORDS_URL}/1", update_data, headers=headers)
     if response.status_code == 401:
-        print(f"无效token正确返回401: {response.json()}")
+        print(f"无效token正确返回401: {loads(response.content)}")
         return True
     else:
         print(f"无效token应该返回401，实际返回: {response.status_code}")
@@ -1,27 +1,47 @@
 #!/usr/bin/env python3
 import sys
 import os
+
+import pytest
+
 sys.path.append('backend')
 os.chdir('backend')
 from app import create_app
 from app.models.user import User, db
 
-def test_login():
-    app = create_app()
-    with app.app_context():
-        # 查找现有用户
-        user = User.find_by_username('testuser')
-        if user:
-            print(f'找到用户: {user.username}')
-            print(f'密码验证正确: {user.check_password("Test123!@#")}')
-            print(f'密码验证错误: {user.check_password("wrongpassword")}')
-            
-            # 检查用户状态
-            print(f'用户激活状态: {user.is_active}')
-            print(f'账户是否锁定: {user.is_account_locked()}')
-            print(f'失败登录次数: {user.failed_login_attempts}')
-        else:
-            print('用户不存在')
+def test_login(app):
+    """检查测试用户的密码与账户状态（app 由调用方或 conftest 夹具提供，应用上下文已推入）"""
+    # 查找现有用户
+    user = User.find_by_username('testuser')
+    if user:
+        print(f'找到用户: {user.username}')
+        print(f'密码验证正确: {user.check_password("Test123!@#")}')
+        print(f'密码验证错误: {user.check_password("wrongpassword")}')
+        
+        # 检查用户状态
+        print(f'用户激活状态: {user.is_active}')
+        print(f'账户是否锁定: {user.is_account_locked()}')
+        print(f'失败登录次数: {user.failed_login_attempts}')
+    else:
+        print('用户不存在')
+
+@pytest.mark.parametrize("username, password, expected_status", [
+    ("testuser", "TestPass123!", 200),
+    ("admin", "AdminPass123!", 200),
+    ("testlogin", "TestLogin123!", 200),
+    ("no_such_user", "TestPass123!", 401),
+])
+def test_login_flow(client, username, password, expected_status):
+    """登录接口：每组凭据一个用例，共用会话级的 client（可用 pytest -n auto 分片）"""
+    response = client.post('/api/auth/login', json={'username': username, 'password': password})
+    assert response.status_code == expected_status, response.get_json()
+    
+    if expected_status == 200:
+        result = response.get_json()
+        assert result['access_token']
+        assert result['user']['username'] == username
 
 if __name__ == '__main__':
-    test_login()
+    app = create_app()
+    with app.app_context():
+        test_login(app)
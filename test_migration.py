@@ -4,123 +4,90 @@ Migration Test Script for AIGTD Database Schema
 This script tests the complete schema migration to ensure it works correctly.
 """
 
-import os
+import json
 import sys
 import sqlite3
-import tempfile
 import subprocess
 from pathlib import Path
 
+import pytest
+
+# Expected schema: table -> required columns (a new table is one more entry)
+SCHEMA = {
+    'users': [
+        'id', 'username', 'email', 'password_hash', 'first_name', 'last_name',
+        'avatar_url', 'is_active', 'is_verified', 'is_admin', 'failed_login_attempts',
+        'last_failed_login', 'account_locked_until', 'refresh_token',
+        'refresh_token_expires_at', 'created_at', 'updated_at', 'last_login_at'
+    ],
+    'records': [
+        'id', 'content', 'category', 'parent_id', 'user_id', 'priority',
+        'progress', 'progress_notes', 'created_at', 'updated_at',
+        'status', 'task_type'
+    ],
+}
+
+# Migration SQL is read once per process and reused by every run
+MIGRATION_FILE = Path(__file__).parent / "supabase/migrations/007_complete_schema_sqlite.sql"
+_MIGRATION_SQL = MIGRATION_FILE.read_text(encoding="utf-8") if MIGRATION_FILE.exists() else None
+
+# Expected columns (JSON array) that pragma_table_info does not report for the table
+MISSING_COLUMNS_SQL = """
+    SELECT value FROM json_each(?)
+    WHERE value NOT IN (SELECT name FROM pragma_table_info(?))
+    ORDER BY value
+"""
+
 def test_sqlite_migration():
     """Test the migration with SQLite database"""
     print("🧪 Testing SQLite migration...")
     
-    # Create temporary database
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp_db:
-        db_path = tmp_db.name
+    # Execute migration (SQLite version, already read at import)
+    if _MIGRATION_SQL is None:
+        pytest.skip(f"Migration file not found: {MIGRATION_FILE}")
+    
+    # In-memory database: nothing outside this process reads it
+    conn = sqlite3.connect(":memory:")
     
     try:
-        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
-        
-        # Read and execute migration (SQLite version)
-        migration_file = Path(__file__).parent / "supabase/migrations/007_complete_schema_sqlite.sql"
-        
-        if not migration_file.exists():
-            print(f"❌ Migration file not found: {migration_file}")
-            return False
-        
-        with open(migration_file, 'r', encoding='utf-8') as f:
-            migration_sql = f.read()
-        
-        # Execute migration (already SQLite compatible)
-        cursor.executescript(migration_sql)
+        cursor.executescript(_MIGRATION_SQL)
         conn.commit()
         
-        # Verify tables exist
+        # Verify tables and columns against SCHEMA
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        expected_tables = ['users', 'records']
-        for table in expected_tables:
-            if table not in tables:
-                print(f"❌ Table {table} not created")
-                return False
+        tables = {row[0] for row in cursor.fetchall()}
         
+        missing_tables = set(SCHEMA) - tables
+        assert not missing_tables, f"Tables not created: {sorted(missing_tables)}"
         print("✅ All tables created successfully")
         
-        # Verify users table structure
-        cursor.execute("PRAGMA table_info(users);")
-        users_columns = [row[1] for row in cursor.fetchall()]
-        expected_users_columns = [
-            'id', 'username', 'email', 'password_hash', 'first_name', 'last_name',
-            'avatar_url', 'is_active', 'is_verified', 'is_admin', 'failed_login_attempts',
-            'last_failed_login', 'account_locked_until', 'refresh_token',
-            'refresh_token_expires_at', 'created_at', 'updated_at', 'last_login_at'
-        ]
-        
-        for col in expected_users_columns:
-            if col not in users_columns:
-                print(f"❌ Users table missing column: {col}")
-                return False
-        
-        print("✅ Users table structure verified")
-        
-        # Verify records table structure
-        cursor.execute("PRAGMA table_info(records);")
-        records_columns = [row[1] for row in cursor.fetchall()]
-        expected_records_columns = [
-            'id', 'content', 'category', 'parent_id', 'user_id', 'priority',
-            'progress', 'progress_notes', 'created_at', 'updated_at',
-            'status', 'task_type'
-        ]
+        # Diff expected vs. actual columns inside SQLite
+        for table, expected_columns in SCHEMA.items():
+            cursor.execute(MISSING_COLUMNS_SQL, (json.dumps(expected_columns), table))
+            missing = [row[0] for row in cursor.fetchall()]
+            assert not missing, f"{table} table missing columns: {missing}"
+            print(f"✅ {table} table structure verified")
         
-        for col in expected_records_columns:
-            if col not in records_columns:
-                print(f"❌ Records table missing column: {col}")
-                return False
-        
-        print("✅ Records table structure verified")
-        
-        # Test data insertion
-        cursor.execute("""
+        # Test data insertion (both inserts in one transaction)
+        cursor.executescript("""
+            BEGIN;
             INSERT OR IGNORE INTO users (username, email, password_hash, first_name, last_name)
-            VALUES ('testuser', 'test@example.com', 'hashed_password', 'Test', 'User')
-        """)
-        
-        cursor.execute("""
+            VALUES ('testuser', 'test@example.com', 'hashed_password', 'Test', 'User');
             INSERT INTO records (content, category, user_id, priority, status, task_type)
-            VALUES ('Test task', 'task', 2, 'medium', 'active', 'work')
+            VALUES ('Test task', 'task', 2, 'medium', 'active', 'work');
+            COMMIT;
         """)
         
-        conn.commit()
-        
         # Verify data
-        cursor.execute("SELECT COUNT(*) FROM users")
-        user_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM records")
-        record_count = cursor.fetchone()[0]
-        
-        if user_count < 1:
-            print(f"❌ Expected at least 1 user, got {user_count}")
-            return False
-        
-        if record_count != 1:
-            print(f"❌ Expected 1 record, got {record_count}")
-            return False
-        
+        cursor.execute("SELECT (SELECT COUNT(*) FROM users), (SELECT COUNT(*) FROM records)")
+        user_count, record_count = cursor.fetchone()
+        assert user_count >= 1, f"Expected at least 1 user, got {user_count}"
+        assert record_count == 1, f"Expected 1 record, got {record_count}"
         print("✅ Data insertion and verification successful")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Migration test failed: {e}")
-        return False
     
     finally:
         conn.close()
-        os.unlink(db_path)
 
 def test_supabase_migration():
     """Test the migration with Supabase (if available)"""
@@ -130,15 +97,13 @@ def test_supabase_migration():
     try:
         result = subprocess.run(['supabase', '--version'], 
                               capture_output=True, text=True, timeout=10)
-        if result.returncode != 0:
-            print("⚠️  Supabase CLI not available, skipping Supabase test")
-            return True
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        print("⚠️  Supabase CLI not available, skipping Supabase test")
-        return True
+        pytest.skip("Supabase CLI not available")
+    
+    if result.returncode != 0:
+        pytest.skip("Supabase CLI not available")
     
     print("✅ Supabase CLI available")
-    return True
 
 def main():
     """Run all migration tests"""
@@ -150,26 +115,33 @@ def main():
         ("Supabase Migration", test_supabase_migration),
     ]
     
-    passed = 0
-    total = len(tests)
+    failed = skipped = 0
     
     for test_name, test_func in tests:
         print(f"\n📋 Running {test_name}...")
-        if test_func():
-            print(f"✅ {test_name} PASSED")
-            passed += 1
+        try:
+            test_func()
+        except pytest.skip.Exception as e:
+            print(f"⚠️  {test_name} SKIPPED: {e}")
+            skipped += 1
+        except AssertionError as e:
+            print(f"❌ {test_name} FAILED: {e}")
+            failed += 1
         else:
-            print(f"❌ {test_name} FAILED")
+            print(f"✅ {test_name} PASSED")
     
     print("\n" + "=" * 50)
-    print(f"📊 Test Results: {passed}/{total} tests passed")
+    print(f"📊 Test Results: {len(tests) - failed - skipped}/{len(tests)} tests passed, {skipped} skipped")
     
-    if passed == total:
-        print("🎉 All tests passed! Migration is ready to use.")
-        return 0
-    else:
+    if failed:
         print("💥 Some tests failed. Please check the migration.")
         return 1
+    elif skipped:
+        print("⚠️  Some tests were skipped; the migration was not fully verified.")
+        return 0
+    else:
+        print("🎉 All tests passed! Migration is ready to use.")
+        return 0
 
 if __name__ == "__main__":
     sys.exit(main())
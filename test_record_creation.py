@@ -1,94 +1,130 @@
 #!/usr/bin/env python3
 import sys
 import os
-import requests
-import json
-sys.path.append('backend')
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+# 按文件位置定位：与切换工作目录的测试（如 test_login）一起收集时也能导入
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(ROOT_DIR, 'backend'))
+sys.path.append(os.path.join(ROOT_DIR, 'scripts'))
 
-def test_record_creation_with_auth():
-    """测试带认证的记录创建"""
-    base_url = 'http://localhost:5050'
+import jwt
+from _http import Client
+from _jsonio import loads, post_json
+from _token_cache import get_token
+
+SESSION = Client()
+
+BASE_URL = 'http://localhost:5050'
+RECORDS_URL = f'{BASE_URL}/api/records'
+
+AUTH_RECORD = {
+    'content': '测试任务：验证用户ID关联',
+    'category': 'task',
+    'task_type': 'work',
+    'priority': 'medium'
+}
+
+GUEST_RECORD = {
+    'content': '匿名用户测试任务',
+    'category': 'task',
+    'task_type': 'work',
+    'priority': 'low'
+}
+
+def create_records(requests_to_send):
+    """
+    并发提交多条记录，共用 SESSION 的连接池
     
-    # 1. 先登录获取token
-    print("1. 登录获取token...")
-    login_data = {
-        'username': 'testlogin',
-        'password': 'TestLogin123!'
-    }
+    先请求一次 /health 预热连接，各线程在屏障处同时放行，
+    因此记录的耗时只包含提交本身，不含建连抖动
+    
+    Args:
+        requests_to_send: [(记录数据, 请求头或None), ...]
+    
+    Returns:
+        与输入顺序一致的 (响应, 耗时秒) 列表
+    """
+    SESSION.get(f'{BASE_URL}/health')
+    barrier = threading.Barrier(len(requests_to_send))
     
-    login_response = requests.post(f'{base_url}/api/auth/login', json=login_data)
-    print(f"登录状态码: {login_response.status_code}")
+    def send(item):
+        record_data, headers = item
+        barrier.wait()
+        started = time.perf_counter()
+        response = post_json(SESSION, RECORDS_URL, record_data, headers=headers)
+        return response, time.perf_counter() - started
+    
+    # 线程数必须等于请求数，否则屏障永远凑不齐
+    with ThreadPoolExecutor(max_workers=len(requests_to_send)) as executor:
+        return list(executor.map(send, requests_to_send))
+
+def test_record_creation_with_auth(create_response=None):
+    """测试带认证的记录创建（create_response 为已并发提交的响应时不再单独请求）"""
+    # 1. 先获取token（优先使用缓存，必要时才登录）
+    print("1. 登录获取token...")
+    access_token = get_token('testlogin', 'TestLogin123!', session=SESSION)
     
-    if login_response.status_code != 200:
-        print("登录失败")
-        return
+    assert access_token, "登录失败"
     
-    login_result = login_response.json()
-    access_token = login_result['access_token']
-    user_info = login_result['user']
+    # 用户ID取自令牌载荷，缓存命中时无需登录响应
+    user_info = {
+        'id': jwt.decode(access_token, options={'verify_signature': False})['user_id'],
+        'username': 'testlogin'
+    }
     print(f"用户ID: {user_info['id']}")
     print(f"用户名: {user_info['username']}")
     
     # 2. 创建记录
     print("\n2. 创建记录...")
-    record_data = {
-        'content': '测试任务：验证用户ID关联',
-        'category': 'task',
-        'task_type': 'work',
-        'priority': 'medium'
-    }
-    
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
-    
-    create_response = requests.post(f'{base_url}/api/records', json=record_data, headers=headers)
+    if create_response is None:
+        headers = {'Authorization': f'Bearer {access_token}'}
+        create_response = post_json(SESSION, RECORDS_URL, AUTH_RECORD, headers=headers)
     print(f"创建记录状态码: {create_response.status_code}")
-    print(f"创建记录响应: {create_response.json()}")
+    body = loads(create_response.content)
+    print(f"创建记录响应: {body}")
+    
+    # 接口统一以200返回成功响应（create_success_response）
+    assert create_response.status_code == 200, f"❌ 记录创建失败: {body}"
+    record = body['record']
+    print(f"✅ 记录创建成功!")
+    print(f"记录ID: {record['id']}")
+    print(f"记录内容: {record['content']}")
+    print(f"用户ID: {record.get('user_id', 'None')}")
     
-    if create_response.status_code == 201:
-        record = create_response.json()['record']
-        print(f"✅ 记录创建成功!")
-        print(f"记录ID: {record['id']}")
-        print(f"记录内容: {record['content']}")
-        print(f"用户ID: {record.get('user_id', 'None')}")
-        
-        # 3. 验证记录是否属于当前用户
-        if record.get('user_id') == user_info['id']:
-            print("✅ 用户ID关联正确!")
-        else:
-            print(f"❌ 用户ID关联错误! 期望: {user_info['id']}, 实际: {record.get('user_id')}")
-    else:
-        print("❌ 记录创建失败")
+    # 3. 验证记录是否属于当前用户
+    assert record.get('user_id') == user_info['id'], \
+        f"❌ 用户ID关联错误! 期望: {user_info['id']}, 实际: {record.get('user_id')}"
+    print("✅ 用户ID关联正确!")
 
-def test_record_creation_without_auth():
+def test_record_creation_without_auth(create_response=None):
     """测试不带认证的记录创建（匿名用户）"""
-    base_url = 'http://localhost:5050'
-    
     print("\n3. 测试匿名用户创建记录...")
-    record_data = {
-        'content': '匿名用户测试任务',
-        'category': 'task',
-        'task_type': 'work',
-        'priority': 'low'
-    }
-    
-    create_response = requests.post(f'{base_url}/api/records', json=record_data)
+    if create_response is None:
+        create_response = post_json(SESSION, RECORDS_URL, GUEST_RECORD)
     print(f"匿名用户创建记录状态码: {create_response.status_code}")
-    print(f"匿名用户创建记录响应: {create_response.json()}")
+    body = loads(create_response.content)
+    print(f"匿名用户创建记录响应: {body}")
     
-    if create_response.status_code == 201:
-        record = create_response.json()['record']
-        print(f"✅ 匿名用户记录创建成功!")
-        print(f"记录ID: {record['id']}")
-        print(f"用户ID: {record.get('user_id', 'None')}")
-        
-        if record.get('user_id') is None:
-            print("✅ 匿名用户ID关联正确!")
-        else:
-            print(f"❌ 匿名用户ID关联错误! 期望: None, 实际: {record.get('user_id')}")
+    assert create_response.status_code == 200, f"❌ 匿名用户记录创建失败: {body}"
+    record = body['record']
+    print(f"✅ 匿名用户记录创建成功!")
+    print(f"记录ID: {record['id']}")
+    print(f"用户ID: {record.get('user_id', 'None')}")
+    
+    assert record.get('user_id') is None, \
+        f"❌ 匿名用户ID关联错误! 期望: None, 实际: {record.get('user_id')}"
+    print("✅ 匿名用户ID关联正确!")
 
 if __name__ == '__main__':
-    test_record_creation_with_auth()
-    test_record_creation_without_auth()
+    # 两条记录互不依赖：先取令牌，再并发提交，最后逐个检查
+    token = get_token('testlogin', 'TestLogin123!', session=SESSION)
+    auth_headers = {'Authorization': f'Bearer {token}'} if token else None
+    (auth_response, auth_elapsed), (guest_response, guest_elapsed) = create_records(
+        [(AUTH_RECORD, auth_headers), (GUEST_RECORD, None)]
+    )
+    print(f"并发提交耗时: 认证 {auth_elapsed * 1000:.1f}ms, 匿名 {guest_elapsed * 1000:.1f}ms")
+    
+    test_record_creation_with_auth(auth_response)
+    test_record_creation_without_auth(guest_response)
@@ -1,100 +1,76 @@
 #!/usr/bin/env python3
 import sys
 import os
+from functools import lru_cache
+
+import jwt
+import pytest
 sys.path.append('backend')
 
-def test_record_creation():
-    """使用Flask测试客户端测试记录创建"""
-    from app import create_app
+@lru_cache(maxsize=128)
+def _verify(token, secret):
+    """校验并解析访问令牌（与后端一致的 PyJWT HS256）；同一令牌重复校验时直接命中缓存"""
+    return jwt.decode(token, secret, algorithms=['HS256'])
+
+@pytest.mark.parametrize('category', ['task', 'idea', 'note', 'general'])
+def test_record_creation(client, db_session, auth, category):
+    """
+    使用Flask测试客户端测试记录创建，每个记录分类一个用例（可用 pytest -n auto 分片）
+    client/db_session/auth 由 conftest 夹具提供：写入在测试结束时回滚，登录在整个会话中只做一次
+    """
     from app.models.user import User
-    from app.models.record import Record, db
-    import jwt
-    from jwt.jwk import OctetJWK
+    from app.models.record import Record
+    
+    # 1. 使用会话级登录得到的token
+    access_token, user_info, headers = auth
+    print("1. 使用已登录的token...")
+    print(f"用户ID: {user_info['id']}")
+    print(f"用户名: {user_info['username']}")
+    
+    # 2. 验证token解析（校验失败时 _verify 直接抛出异常）
+    print("\n2. 验证token解析...")
+    secret_key = client.application.config.get('JWT_SECRET_KEY', 'your-secret-key-here')
+    payload = _verify(access_token, secret_key)
+    print(f"Token解析成功，用户ID: {payload['user_id']}")
+    
+    # 查找用户
+    user = User.find_by_id(payload['user_id'])
+    assert user is not None, f"找不到token中的用户: {payload['user_id']}"
+    print(f"找到用户: {user.username}")
+    
+    # 3. 创建记录
+    print(f"\n3. 创建记录（{category}）...")
+    record_data = {
+        'content': f'测试{category}：验证用户ID关联',
+        'category': category,
+        'task_type': 'work',
+        'priority': 'medium'
+    }
+    
+    create_response = client.post('/api/records', json=record_data, headers=headers)
+    print(f"创建记录状态码: {create_response.status_code}")
+    body = create_response.get_json()
+    
+    # 接口统一以200返回成功响应（create_success_response）
+    assert create_response.status_code == 200, f"❌ 记录创建失败: {body}"
+    record = body['record']
+    print(f"✅ 记录创建成功!")
+    print(f"记录ID: {record['id']}")
+    print(f"记录内容: {record['content']}")
+    print(f"用户ID: {record.get('user_id', 'None')}")
     
-    app = create_app()
+    # 4. 验证记录是否属于当前用户
+    assert record.get('user_id') == user_info['id'], \
+        f"❌ 用户ID关联错误! 期望: {user_info['id']}, 实际: {record.get('user_id')}"
+    print("✅ 用户ID关联正确!")
     
-    with app.app_context():
-        with app.test_client() as client:
-            # 1. 先登录获取token
-            print("1. 登录获取token...")
-            login_data = {
-                'username': 'testlogin',
-                'password': 'TestLogin123!'
-            }
-            
-            login_response = client.post('/api/auth/login', json=login_data)
-            print(f"登录状态码: {login_response.status_code}")
-            
-            if login_response.status_code != 200:
-                print("登录失败")
-                return
-            
-            login_result = login_response.get_json()
-            access_token = login_result['access_token']
-            user_info = login_result['user']
-            print(f"用户ID: {user_info['id']}")
-            print(f"用户名: {user_info['username']}")
-            
-            # 2. 验证token解析
-            print("\n2. 验证token解析...")
-            try:
-                secret_key = app.config.get('JWT_SECRET_KEY', 'your-secret-key-here')
-                jwk = OctetJWK(secret_key.encode('utf-8'))
-                jwt_instance = jwt.JWT()
-                payload = jwt_instance.decode(access_token, jwk)
-                print(f"Token解析成功，用户ID: {payload['user_id']}")
-                
-                # 查找用户
-                user = User.find_by_id(payload['user_id'])
-                print(f"找到用户: {user.username if user else 'None'}")
-            except Exception as e:
-                print(f"Token解析失败: {e}")
-                return
-            
-            # 3. 创建记录
-            print("\n3. 创建记录...")
-            record_data = {
-                'content': '测试任务：验证用户ID关联',
-                'category': 'task',
-                'task_type': 'work',
-                'priority': 'medium'
-            }
-            
-            headers = {
-                'Authorization': f'Bearer {access_token}'
-            }
-            
-            create_response = client.post('/api/records', json=record_data, headers=headers)
-            print(f"创建记录状态码: {create_response.status_code}")
-            
-            if create_response.status_code == 201:
-                record = create_response.get_json()['record']
-                print(f"✅ 记录创建成功!")
-                print(f"记录ID: {record['id']}")
-                print(f"记录内容: {record['content']}")
-                print(f"用户ID: {record.get('user_id', 'None')}")
-                
-                # 4. 验证记录是否属于当前用户
-                if record.get('user_id') == user_info['id']:
-                    print("✅ 用户ID关联正确!")
-                else:
-                    print(f"❌ 用户ID关联错误! 期望: {user_info['id']}, 实际: {record.get('user_id')}")
-                
-                # 5. 验证数据库中的记录
-                print("\n4. 验证数据库中的记录...")
-                db_record = Record.query.get(record['id'])
-                if db_record:
-                    print(f"数据库记录用户ID: {db_record.user_id}")
-                    if db_record.user_id == user_info['id']:
-                        print("✅ 数据库中的用户ID关联正确!")
-                    else:
-                        print(f"❌ 数据库中的用户ID关联错误!")
-                else:
-                    print("❌ 在数据库中找不到记录")
-                    
-            else:
-                print("❌ 记录创建失败")
-                print(f"错误信息: {create_response.get_json()}")
+    # 5. 验证数据库中的记录
+    print("\n4. 验证数据库中的记录...")
+    db_record = db_session.get(Record, record['id'])
+    assert db_record is not None, "❌ 在数据库中找不到记录"
+    print(f"数据库记录用户ID: {db_record.user_id}")
+    assert db_record.user_id == user_info['id'], "❌ 数据库中的用户ID关联错误!"
+    print("✅ 数据库中的用户ID关联正确!")
 
 if __name__ == '__main__':
-    test_record_creation()
+    sys.exit(pytest.main([__file__, '-x']))